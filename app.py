@@ -3,13 +3,20 @@
 
 from uagents import Agent, Context, Protocol
 import os
-import spotipy
+from spotipy.cache_handler import CacheFileHandler
 from spotipy.oauth2 import SpotifyOAuth
-import json
+import orjson
 import requests
-import base64
 import time
-from typing import Dict, List, Optional, Any
+import asyncio
+import functools
+import hashlib
+import aiohttp
+import redis
+from rapidfuzz import fuzz, process
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 
 # Define our main playlist transfer agent
 playlist_transfer_agent = Agent(
@@ -42,9 +49,10 @@ async def handle_playlist_transfer(ctx: Context, sender: str, msg: PlaylistTrans
     ctx.logger.info(f"Received playlist transfer request from {sender}")
     
     try:
-        # Step 1: Extract songs from source platform (Spotify in this example)
+        # Step 1: Stream songs from source platform (Spotify in this example);
+        # pages are consumed by the destination search as soon as they arrive
         if msg.source_platform.lower() == "spotify":
-            tracks = await extract_spotify_playlist(ctx, msg.source_playlist_id)
+            track_pages = iter_spotify_playlist(ctx, msg.source_playlist_id)
         else:
             raise ValueError(f"Unsupported source platform: {msg.source_platform}")
         
@@ -52,14 +60,14 @@ async def handle_playlist_transfer(ctx: Context, sender: str, msg: PlaylistTrans
         if msg.destination_platform.lower() == "apple_music":
             result = await create_apple_music_playlist(
                 ctx, 
-                tracks,
+                track_pages,
                 f"Imported from Spotify",
                 msg.destination_user_id
             )
         elif msg.destination_platform.lower() == "youtube_music":
             result = await create_youtube_music_playlist(
                 ctx, 
-                tracks,
+                track_pages,
                 f"Imported from Spotify",
                 msg.destination_user_id
             )
@@ -91,59 +99,314 @@ async def handle_playlist_transfer(ctx: Context, sender: str, msg: PlaylistTrans
 # Register the protocol with our agent
 playlist_transfer_agent.include(playlist_protocol)
 
-# ---- Platform-specific implementations ----
+# ---- Shared HTTP connection pools ----
 
-async def extract_spotify_playlist(ctx: Context, playlist_id: str) -> List[Dict[str, str]]:
-    """Extract tracks from a Spotify playlist"""
-    ctx.logger.info(f"Extracting tracks from Spotify playlist: {playlist_id}")
+# Async session for destination-platform searches. ClientSession has to be
+# created inside a running event loop, so it is built lazily on first use.
+_http: Optional[aiohttp.ClientSession] = None
+
+# Sync session for blocking code paths (keep-alive + retries on https://)
+_sync_http = requests.Session()
+_sync_http.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use"""
+    global _http
+    if _http is None or _http.closed:
+        _http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        )
+    return _http
+
+@playlist_transfer_agent.on_event("shutdown")
+async def close_http_sessions(ctx: Context):
+    """Close the shared HTTP sessions when the agent stops"""
+    if _http is not None and not _http.closed:
+        await _http.close()
+    _sync_http.close()
+
+# ---- Cross-transfer match cache ----
+
+# How long a destination-platform match stays cached (30 days)
+MATCH_CACHE_TTL = 30 * 86400
+
+# Redis client for the match cache; left as None when REDIS_URL isn't configured
+_redis: Optional[redis.Redis] = None
+
+def _get_redis() -> Optional[redis.Redis]:
+    """Return the shared Redis client, or None if caching is disabled"""
+    global _redis
+    if _redis is None:
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            return None
+        _redis = redis.Redis.from_url(redis_url, decode_responses=True)
+    return _redis
+
+def _match_cache_key(platform: str, track: Dict[str, str]) -> str:
+    """Cache key for a track: its ISRC when known, else a hash of artist and title"""
+    if track.get('isrc'):
+        return f"match:{platform}:isrc:{track['isrc']}"
+    
+    normalized = f"{track['artist'].strip().lower()}|{track['name'].strip().lower()}"
+    return f"match:{platform}:name:{hashlib.sha1(normalized.encode()).hexdigest()}"
+
+def get_cached_matches(ctx: Context, keys: List[str]) -> List[Optional[str]]:
+    """Look up cached destination IDs for all match keys in a single round-trip"""
+    client = _get_redis()
+    if client is None or not keys:
+        return [None] * len(keys)
+    
+    try:
+        return client.mget(keys)
+    except redis.RedisError as e:
+        ctx.logger.warning(f"Match cache lookup failed: {str(e)}")
+        return [None] * len(keys)
+
+def set_cached_matches(ctx: Context, matches: Dict[str, str]) -> None:
+    """Store newly found destination IDs, keyed by their match cache keys"""
+    client = _get_redis()
+    if client is None or not matches:
+        return
     
-    # Set up Spotify client with proper OAuth
-    sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key, platform_id in matches.items():
+            pipe.set(key, platform_id, ex=MATCH_CACHE_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        ctx.logger.warning(f"Match cache update failed: {str(e)}")
+
+# ---- Platform-specific implementations ----
+
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+
+# Partial-response mask for Spotify playlist pages (only the fields we use)
+SPOTIFY_PLAYLIST_FIELDS = "items(track(name,uri,artists(name),album(name),external_ids(isrc))),total"
+
+# Maximum page size for playlist items, and how many pages may be in flight
+SPOTIFY_PAGE_SIZE = 100
+SPOTIFY_PAGE_CONCURRENCY = 8
+
+def _spotify_track_info(track: Dict[str, Any]) -> Dict[str, str]:
+    """Build the transfer dict for a single Spotify track"""
+    return {
+        'name': track['name'],
+        'artist': track['artists'][0]['name'],
+        'album': track['album']['name'],
+        'spotify_uri': track['uri'],
+        'isrc': track.get('external_ids', {}).get('isrc')
+    }
+
+@functools.lru_cache(maxsize=1)
+def _spotify_auth_manager() -> SpotifyOAuth:
+    """Build the Spotify OAuth manager once and reuse it for every transfer"""
+    return SpotifyOAuth(
         client_id=os.getenv("SPOTIFY_CLIENT_ID"),
         client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
         redirect_uri=os.getenv("SPOTIFY_REDIRECT_URI"),
-        scope="playlist-read-private"
-    ))
+        scope="playlist-read-private",
+        cache_handler=CacheFileHandler(cache_path=".spotipy_cache"),
+        # Token refreshes reuse the pooled keep-alive session
+        requests_session=_sync_http
+    )
+
+async def _fetch_spotify_page(
+    session: aiohttp.ClientSession,
+    token: str,
+    playlist_id: str,
+    offset: int,
+    sem: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Fetch one page of playlist items from the Spotify Web API"""
+    async with sem:
+        async with session.get(
+            f"{SPOTIFY_API_URL}/playlists/{playlist_id}/tracks",
+            params={
+                "offset": offset,
+                "limit": SPOTIFY_PAGE_SIZE,
+                "fields": SPOTIFY_PLAYLIST_FIELDS,
+                "additional_types": "track"
+            },
+            headers={"Authorization": f"Bearer {token}"}
+        ) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+
+async def iter_spotify_playlist(ctx: Context, playlist_id: str) -> AsyncIterator[List[Dict[str, str]]]:
+    """Yield the tracks of a Spotify playlist one page at a time"""
+    ctx.logger.info(f"Extracting tracks from Spotify playlist: {playlist_id}")
+    
+    # Getting the token may read the cache file or refresh it over the network,
+    # so it runs in a worker thread
+    token = await asyncio.to_thread(_spotify_auth_manager().get_access_token, as_dict=False)
+    
+    # Pages are fetched through the shared aiohttp session rather than spotipy,
+    # so they don't block the event loop and can be requested concurrently
+    session = _get_http_session()
+    sem = asyncio.Semaphore(SPOTIFY_PAGE_CONCURRENCY)
+    first_page = await _fetch_spotify_page(session, token, playlist_id, 0, sem)
     
-    # Get playlist details
-    results = sp.playlist_items(playlist_id)
+    # Once the total is known, request every remaining page at once
+    remaining_pages = [
+        asyncio.create_task(_fetch_spotify_page(session, token, playlist_id, offset, sem))
+        for offset in range(SPOTIFY_PAGE_SIZE, first_page['total'], SPOTIFY_PAGE_SIZE)
+    ]
     
-    # Extract relevant track info
+    try:
+        results = first_page
+        for next_page in remaining_pages + [None]:
+            # Extract relevant track info (collaborative playlists can contain null tracks)
+            yield [_spotify_track_info(item['track']) for item in results['items'] if item.get('track')]
+            
+            if next_page is not None:
+                results = await next_page
+    finally:
+        # Cancel the pages not consumed yet and wait for them, so a failed or
+        # abandoned transfer leaves no fetch running or error unretrieved
+        for task in remaining_pages:
+            task.cancel()
+        await asyncio.gather(*remaining_pages, return_exceptions=True)
+
+async def extract_spotify_playlist(ctx: Context, playlist_id: str) -> List[Dict[str, str]]:
+    """Extract all tracks from a Spotify playlist"""
     tracks = []
-    for item in results['items']:
-        track = item['track']
-        track_info = {
-            'name': track['name'],
-            'artist': track['artists'][0]['name'],
-            'album': track['album']['name'],
-            'spotify_uri': track['uri']
-        }
-        tracks.append(track_info)
-        
-    # Handle pagination if the playlist has more than 100 tracks
-    while results['next']:
-        results = sp.next(results)
-        for item in results['items']:
-            track = item['track']
-            track_info = {
-                'name': track['name'],
-                'artist': track['artists'][0]['name'],
-                'album': track['album']['name'],
-                'spotify_uri': track['uri']
-            }
-            tracks.append(track_info)
+    async for page in iter_spotify_playlist(ctx, playlist_id):
+        tracks.extend(page)
     
     ctx.logger.info(f"Extracted {len(tracks)} tracks from Spotify playlist")
     return tracks
 
+# Maximum number of in-flight destination searches per transfer (keeps us under
+# platform rate limits while still overlapping the HTTP round-trips)
+SEARCH_CONCURRENCY = 10
+
+# Minimum WRatio score (0-100) for a search candidate to count as a match
+MATCH_SCORE_CUTOFF = 80
+
+def _best_candidate(track: Dict[str, str], candidates: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """Pick the search candidate that best matches the track, if any is close enough"""
+    best = process.extractOne(
+        f"{track['name']} {track['artist']}",
+        [f"{candidate['title']} {candidate['artist']}" for candidate in candidates],
+        scorer=fuzz.WRatio,
+        score_cutoff=MATCH_SCORE_CUTOFF
+    )
+    return candidates[best[2]] if best else None
+
+async def _search_one(
+    track: Dict[str, str],
+    platform: str,
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Search for a single track on the destination platform"""
+    async with sem:
+        # In production, you would search the destination platform API here
+        # through the shared `session` so connections are reused across tracks
+        # Mock search results for demonstration
+        candidates = [{
+            "id": f"mock_id_{track['name']}",
+            "title": track['name'],
+            "artist": track['artist']
+        }]
+    
+    match = _best_candidate(track, candidates)
+    if match is None:
+        raise LookupError("No sufficiently close match found")
+    
+    return {
+        f"{platform}_id": match["id"],
+        "original_track": track
+    }
+
+async def _search_tracks(
+    ctx: Context,
+    track_pages: AsyncIterator[List[Dict[str, str]]],
+    platform: str,
+    platform_name: str
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    """Search for tracks as their pages arrive and split them into found and failed"""
+    id_key = f"{platform}_id"
+    session = _get_http_session()
+    sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    
+    # One cached ID or in-flight search task per unique match key, so duplicate
+    # tracks in the playlist share a single lookup
+    entries = {}
+    
+    # (track, match key), in playlist order
+    pending = []
+    
+    try:
+        async for page in track_pages:
+            keys = [_match_cache_key(platform, track) for track in page]
+            
+            # Only look up keys not already seen earlier in this playlist, and
+            # only search for those that aren't in the match cache either
+            new_keys = {}
+            for key, track in zip(keys, page):
+                if key not in entries:
+                    new_keys.setdefault(key, track)
+            
+            cached_ids = get_cached_matches(ctx, list(new_keys))
+            for (key, track), cached_id in zip(new_keys.items(), cached_ids):
+                if cached_id is None:
+                    entries[key] = asyncio.create_task(_search_one(track, platform, session, sem))
+                else:
+                    entries[key] = cached_id
+            
+            pending.extend(zip(page, keys))
+    except BaseException:
+        for entry in entries.values():
+            if isinstance(entry, asyncio.Task):
+                entry.cancel()
+        raise
+    
+    await asyncio.gather(
+        *[entry for entry in entries.values() if isinstance(entry, asyncio.Task)],
+        return_exceptions=True
+    )
+    
+    found_tracks = []
+    failed_tracks = []
+    new_matches = {}
+    
+    for track, key in pending:
+        entry = entries[key]
+        if not isinstance(entry, asyncio.Task):
+            found_tracks.append({id_key: entry, "original_track": track})
+            continue
+        
+        error = entry.exception()
+        if error is not None:
+            ctx.logger.warning(f"Failed to find track {track['name']} by {track['artist']} on {platform_name}: {str(error)}")
+            failed_tracks.append({
+                "name": track['name'],
+                "artist": track['artist'],
+                "reason": str(error)
+            })
+        else:
+            platform_id = entry.result()[id_key]
+            found_tracks.append({id_key: platform_id, "original_track": track})
+            new_matches[key] = platform_id
+    
+    set_cached_matches(ctx, new_matches)
+    
+    return found_tracks, failed_tracks
+
 async def create_apple_music_playlist(
     ctx: Context, 
-    tracks: List[Dict[str, str]], 
+    track_pages: AsyncIterator[List[Dict[str, str]]], 
     playlist_name: str,
     user_id: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Create a playlist on Apple Music with the given tracks"""
-    ctx.logger.info(f"Creating Apple Music playlist with {len(tracks)} tracks")
+    """Create a playlist on Apple Music with the tracks yielded page by page"""
+    ctx.logger.info(f"Creating Apple Music playlist")
     
     # In a real implementation, you would:
     # 1. Authenticate with Apple Music API using developer token
@@ -154,25 +417,8 @@ async def create_apple_music_playlist(
     # This is a simplified mock implementation
     # In production, you would use the Apple Music API
     
-    # Mock searching for tracks on Apple Music
-    found_tracks = []
-    failed_tracks = []
-    
-    for track in tracks:
-        try:
-            # In production, you would search Apple Music API here
-            # Mock successful match for demonstration
-            found_tracks.append({
-                "apple_music_id": f"mock_id_{track['name']}",
-                "original_track": track
-            })
-        except Exception as e:
-            ctx.logger.warning(f"Failed to find track {track['name']} by {track['artist']} on Apple Music: {str(e)}")
-            failed_tracks.append({
-                "name": track['name'],
-                "artist": track['artist'],
-                "reason": str(e)
-            })
+    # Search for tracks concurrently on Apple Music while the source is still paging
+    found_tracks, failed_tracks = await _search_tracks(ctx, track_pages, "apple_music", "Apple Music")
     
     # Mock creating a playlist
     # In production, you would call Apple Music API to create playlist and add tracks
@@ -188,12 +434,12 @@ async def create_apple_music_playlist(
 
 async def create_youtube_music_playlist(
     ctx: Context, 
-    tracks: List[Dict[str, str]], 
+    track_pages: AsyncIterator[List[Dict[str, str]]], 
     playlist_name: str,
     user_id: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Create a playlist on YouTube Music with the given tracks"""
-    ctx.logger.info(f"Creating YouTube Music playlist with {len(tracks)} tracks")
+    """Create a playlist on YouTube Music with the tracks yielded page by page"""
+    ctx.logger.info(f"Creating YouTube Music playlist")
     
     # In a real implementation, you would:
     # 1. Authenticate with YouTube Music API
@@ -204,25 +450,8 @@ async def create_youtube_music_playlist(
     # This is a simplified mock implementation
     # In production, you would use the YouTube API
     
-    # Mock searching for tracks on YouTube Music
-    found_tracks = []
-    failed_tracks = []
-    
-    for track in tracks:
-        try:
-            # In production, you would search YouTube Music API here
-            # Mock successful match for demonstration
-            found_tracks.append({
-                "youtube_music_id": f"mock_id_{track['name']}",
-                "original_track": track
-            })
-        except Exception as e:
-            ctx.logger.warning(f"Failed to find track {track['name']} by {track['artist']} on YouTube Music: {str(e)}")
-            failed_tracks.append({
-                "name": track['name'],
-                "artist": track['artist'],
-                "reason": str(e)
-            })
+    # Search for tracks concurrently on YouTube Music while the source is still paging
+    found_tracks, failed_tracks = await _search_tracks(ctx, track_pages, "youtube_music", "YouTube Music")
     
     # Mock creating a playlist
     # In production, you would call YouTube Music API to create playlist and add tracks
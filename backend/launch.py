@@ -8,10 +8,12 @@ This script launches the BeatBridge backend service and its dependencies.
 import os
 import sys
 import signal
+import shutil
 import subprocess
 import time
 import argparse
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Define colors for output
 GREEN = "\033[0;32m"
@@ -32,20 +34,23 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 def run_command(command, name, env=None):
-    """Run a command as a subprocess."""
+    """Run a command (an argv list) as a subprocess."""
     try:
         # Create logs directory if it doesn't exist
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
         
-        # Open log files
-        stdout_log = open(f"logs/{name}.log", "a")
-        stderr_log = open(f"logs/{name}.err", "a")
+        # Open log files in binary append mode
+        stdout_log = open(f"logs/{name}.log", "ab")
+        stderr_log = open(f"logs/{name}.err", "ab")
         
-        # Add timestamp to logs
+        # Add timestamp to logs; flush so the header lands before the
+        # child starts writing to the same file descriptor
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        stdout_log.write(f"\n\n--- {name} started at {timestamp} ---\n\n")
-        stderr_log.write(f"\n\n--- {name} started at {timestamp} ---\n\n")
+        header = f"\n\n--- {name} started at {timestamp} ---\n\n".encode()
+        for log in (stdout_log, stderr_log):
+            log.write(header)
+            log.flush()
         
         # Start process
         print(f"{BLUE}Starting {name}...{RESET}")
@@ -53,8 +58,7 @@ def run_command(command, name, env=None):
             command,
             stdout=stdout_log,
             stderr=stderr_log,
-            env=env,
-            shell=True
+            env=env
         )
         
         # Add to list of processes
@@ -71,36 +75,48 @@ def check_redis():
     """Check if Redis is running."""
     try:
         import redis
-        
-        # Get Redis URL from environment or use default
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        
-        # Try to connect to Redis
-        r = redis.from_url(redis_url)
+    except ImportError as e:
+        print(f"{RED}Redis is not running: {str(e)}{RESET}")
+        return False
+    
+    # Get Redis URL from environment or use default
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    
+    # A missing Unix socket means Redis is not running; skip the connection attempt
+    if redis_url.startswith("unix://"):
+        socket_path = urlparse(redis_url).path
+        if not os.path.exists(socket_path):
+            print(f"{RED}Redis is not running: socket {socket_path} not found{RESET}")
+            return False
+    
+    try:
+        # Try to connect to Redis, failing fast if nothing is listening
+        r = redis.from_url(redis_url, socket_connect_timeout=0.3, socket_timeout=0.3)
         r.ping()
         
         print(f"{GREEN}Redis is running.{RESET}")
         return True
         
-    except Exception as e:
+    # A malformed REDIS_URL raises ValueError rather than a Redis error
+    except (redis.exceptions.RedisError, ValueError) as e:
         print(f"{RED}Redis is not running: {str(e)}{RESET}")
         return False
 
 def setup_environment():
     """Set up the environment for the services."""
-    # Load environment variables from .env file
-    if Path("../.env").exists():
-        print(f"{BLUE}Loading environment variables from ../.env{RESET}")
-        with open("../.env", "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
-                    os.environ[key] = value
+    # Load environment variables from .env file in a single pass
+    env_path = Path("../.env")
+    if env_path.exists():
+        print(f"{BLUE}Loading environment variables from {env_path}{RESET}")
+        os.environ.update({
+            key.strip(): value.strip()
+            for raw in env_path.read_text().splitlines()
+            if (line := raw.strip()) and not line.startswith("#") and "=" in line
+            for key, value in [line.split("=", 1)]
+        })
     
     # Make sure FLASK_APP is set
-    if "FLASK_APP" not in os.environ:
-        os.environ["FLASK_APP"] = "service.py"
+    os.environ.setdefault("FLASK_APP", "service.py")
     
     return dict(os.environ)
 
@@ -136,7 +152,8 @@ def main():
         # Check if Redis is already running
         if not check_redis():
             print(f"{YELLOW}Starting Redis server...{RESET}")
-            redis_proc = run_command("redis-server", "redis")
+            redis_server = shutil.which("redis-server")
+            redis_proc = run_command([redis_server], "redis") if redis_server else None
             if not redis_proc:
                 print(f"{RED}Failed to start Redis. Is it installed?{RESET}")
                 print(f"{YELLOW}You can install Redis or use --no-redis to skip.{RESET}")
@@ -149,7 +166,7 @@ def main():
     if not args.no_worker:
         print(f"{BLUE}Starting RQ worker...{RESET}")
         worker_proc = run_command(
-            "rq worker beatbridge --url redis://localhost:6379/0",
+            ["rq", "worker", "beatbridge", "--url", "redis://localhost:6379/0"],
             "rq-worker",
             env=env
         )
@@ -157,7 +174,7 @@ def main():
     # Start Flask application
     print(f"{BLUE}Starting BeatBridge backend service...{RESET}")
     flask_proc = run_command(
-        f"gunicorn --bind {args.host}:{args.port} --workers 3 service:app",
+        ["gunicorn", "--bind", f"{args.host}:{args.port}", "--workers", "3", "service:app"],
         "backend-service",
         env=env
     )
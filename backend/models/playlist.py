@@ -9,7 +9,7 @@ from typing import Dict, List, Optional, Any
 from .track import Track
 
 
-@dataclass
+@dataclass(slots=True)
 class Playlist:
     """
     Represents a music playlist with cross-platform identifiers.
@@ -48,8 +48,16 @@ class Playlist:
         """String representation of the playlist."""
         return f"{self.name} ({len(self.tracks)} tracks) on {self.platform}"
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert playlist to dictionary."""
+    def to_dict(self, preview: int = 10) -> Dict[str, Any]:
+        """
+        Convert playlist to dictionary.
+        
+        Args:
+            preview: Number of leading tracks to include; 0 skips track serialization
+            
+        Returns:
+            Dict[str, Any]: The playlist as a dictionary
+        """
         return {
             'id': self.id,
             'name': self.name,
@@ -63,8 +71,8 @@ class Playlist:
             'collaborative': self.collaborative,
             'created_at': self.created_at,
             'track_count': len(self.tracks),
-            'tracks': [track.to_dict() for track in self.tracks[:10]],  # Include first 10 tracks for preview
-            'has_more_tracks': len(self.tracks) > 10
+            'tracks': [track.to_dict() for track in self.tracks[:preview]] if preview > 0 else [],
+            'has_more_tracks': len(self.tracks) > preview
         }
     
     @classmethod
@@ -109,7 +117,7 @@ class Playlist:
             bool: True if track was removed, False if not found
         """
         for i, track in enumerate(self.tracks):
-            if track.platform_ids.get(self.platform) == track_id:
+            if track.get_platform_id(self.platform) == track_id:
                 self.tracks.pop(i)
                 return True
         return False
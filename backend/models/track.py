@@ -4,11 +4,40 @@ Track Model
 This module defines the Track class used to represent a music track across different platforms.
 """
 
-from dataclasses import dataclass, field
+import re
+import string
+import unicodedata
+from dataclasses import MISSING, dataclass, field, fields
 from typing import Dict, List, Optional, Any
 
 
-@dataclass
+# Patterns and tables used to normalize names for cross-platform matching
+_FEAT_RE = re.compile(r'\s*\b(?:feat\.|ft\.|featuring)[^()]*', re.IGNORECASE)
+_BRACKETS_RE = re.compile(r'\s*[\(\[][^)\]]*[\)\]]')
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a track or artist name for fuzzy matching.
+    
+    Strips featured-artist and bracketed suffixes, folds accents to ASCII,
+    lowercases, and removes punctuation. Falls back to the lowercased input
+    when nothing survives (e.g. non-Latin titles).
+    
+    Args:
+        text: The name to normalize
+        
+    Returns:
+        str: The normalized name
+    """
+    cleaned = _BRACKETS_RE.sub('', _FEAT_RE.sub('', text))
+    cleaned = unicodedata.normalize('NFKD', cleaned).encode('ascii', 'ignore').decode()
+    cleaned = ' '.join(cleaned.lower().translate(_PUNCTUATION_TABLE).split())
+    return cleaned or text.lower().strip()
+
+
+@dataclass(slots=True)
 class Track:
     """
     Represents a music track with cross-platform identifiers.
@@ -19,15 +48,24 @@ class Track:
         album (str): The album name
         duration_ms (int): Track duration in milliseconds
         isrc (Optional[str]): International Standard Recording Code (used for cross-platform matching)
-        uri (Dict[str, str]): Dictionary of platform URIs keyed by platform name
-        platform_ids (Dict[str, str]): Dictionary of platform-specific IDs
-        additional_artists (List[str]): List of additional artist names (beyond primary)
+        uri (Optional[Dict[str, str]]): Dictionary of platform URIs keyed by platform name
+        platform_ids (Optional[Dict[str, str]]): Dictionary of platform-specific IDs
+        additional_artists (Optional[List[str]]): List of additional artist names (beyond primary)
         release_year (Optional[int]): Year the track was released
         album_art_url (Optional[str]): URL to the album artwork
         explicit (bool): Whether the track contains explicit content
         popularity (Optional[int]): Platform-specific popularity score (0-100)
-        genres (List[str]): List of genres associated with the track
-        metadata (Dict[str, Any]): Additional platform-specific metadata
+        genres (Optional[List[str]]): List of genres associated with the track
+        metadata (Optional[Dict[str, Any]]): Additional platform-specific metadata
+        _norm_name (str): Normalized track name, computed once for matching
+        _norm_artist (str): Normalized artist name, computed once for matching
+        _album_lc (str): Lowercased album name, computed once for matching
+        _dedup_key (str): Lowercased "name|artist" key used to spot duplicates
+        _search_query (str): Cached cross-platform search query
+        _clean_title (str): Track name without featured artists or bracketed suffixes
+        
+    The collection attributes default to None rather than empty containers so
+    that building a track allocates nothing it does not use.
     """
     
     name: str
@@ -35,15 +73,63 @@ class Track:
     album: str = ""
     duration_ms: int = 0
     isrc: Optional[str] = None
-    uri: Dict[str, str] = field(default_factory=dict)
-    platform_ids: Dict[str, str] = field(default_factory=dict)
-    additional_artists: List[str] = field(default_factory=list)
+    uri: Optional[Dict[str, str]] = None
+    platform_ids: Optional[Dict[str, str]] = None
+    additional_artists: Optional[List[str]] = None
     release_year: Optional[int] = None
     album_art_url: Optional[str] = None
     explicit: bool = False
     popularity: Optional[int] = None
-    genres: List[str] = field(default_factory=list)
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    genres: Optional[List[str]] = None
+    metadata: Optional[Dict[str, Any]] = None
+    _norm_name: str = field(init=False, repr=False, compare=False)
+    _norm_artist: str = field(init=False, repr=False, compare=False)
+    _album_lc: str = field(init=False, repr=False, compare=False)
+    _dedup_key: str = field(init=False, repr=False, compare=False)
+    _search_query: str = field(init=False, repr=False, compare=False)
+    _clean_title: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """Precompute the normalized matching keys and search query."""
+        self._clean_title = _BRACKETS_RE.sub('', _FEAT_RE.sub('', self.name)).strip()
+        self._norm_name = normalize_text(self.name)
+        self._norm_artist = normalize_text(self.artist)
+        self._album_lc = (self.album or "").lower()
+        self._dedup_key = f"{self.name.lower()}|{self.artist.lower()}"
+        self._search_query = self.name + ' ' + self.artist
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle only the data fields; the derived matching keys are rebuilt on load."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a pickled track and recompute its derived fields.
+        
+        Fields missing from the state (pickled before they were added) get
+        their default.
+        
+        Raises:
+            TypeError: For pickles from before the state was keyed by field
+                name, or missing a field without a default, so disk caches
+                discard them instead of misreading them
+        """
+        if not isinstance(state, dict):
+            raise TypeError("Unsupported Track pickle state")
+        
+        for f in fields(self):
+            if not f.init:
+                continue
+            if f.name in state:
+                value = state[f.name]
+            elif f.default is not MISSING:
+                value = f.default
+            elif f.default_factory is not MISSING:
+                value = f.default_factory()
+            else:
+                raise TypeError(f"Track pickle is missing required field {f.name!r}")
+            object.__setattr__(self, f.name, value)
+        self.__post_init__()
     
     def __str__(self) -> str:
         """String representation of the track."""
@@ -57,14 +143,14 @@ class Track:
             'album': self.album,
             'duration_ms': self.duration_ms,
             'isrc': self.isrc,
-            'uri': self.uri,
-            'platform_ids': self.platform_ids,
-            'additional_artists': self.additional_artists,
+            'uri': self.uri or {},
+            'platform_ids': self.platform_ids or {},
+            'additional_artists': self.additional_artists or [],
             'release_year': self.release_year,
             'album_art_url': self.album_art_url,
             'explicit': self.explicit,
             'popularity': self.popularity,
-            'genres': self.genres
+            'genres': self.genres or []
         }
     
     @classmethod
@@ -76,17 +162,41 @@ class Track:
             album=data.get('album', ''),
             duration_ms=data.get('duration_ms', 0),
             isrc=data.get('isrc'),
-            uri=data.get('uri', {}),
-            platform_ids=data.get('platform_ids', {}),
-            additional_artists=data.get('additional_artists', []),
+            uri=data.get('uri'),
+            platform_ids=data.get('platform_ids'),
+            additional_artists=data.get('additional_artists'),
             release_year=data.get('release_year'),
             album_art_url=data.get('album_art_url'),
             explicit=data.get('explicit', False),
             popularity=data.get('popularity'),
-            genres=data.get('genres', []),
-            metadata=data.get('metadata', {})
+            genres=data.get('genres'),
+            metadata=data.get('metadata')
         )
     
+    def get_uri(self, platform: str) -> Optional[str]:
+        """Get the track URI on a platform, or None if unknown."""
+        return self.uri.get(platform) if self.uri else None
+    
+    def get_platform_id(self, platform: str) -> Optional[str]:
+        """Get the track ID on a platform, or None if unknown."""
+        return self.platform_ids.get(platform) if self.platform_ids else None
+    
+    def merge_platform_data(self, other: 'Track') -> None:
+        """
+        Copy the platform URIs and IDs of a matched track onto this track.
+        
+        Args:
+            other: The matching track on another platform
+        """
+        if other.uri:
+            if self.uri is None:
+                self.uri = {}
+            self.uri.update(other.uri)
+        if other.platform_ids:
+            if self.platform_ids is None:
+                self.platform_ids = {}
+            self.platform_ids.update(other.platform_ids)
+    
     def get_artists_string(self) -> str:
         """Get string representation of all artists."""
         if not self.additional_artists:
@@ -98,6 +208,15 @@ class Track:
         
         return f"{', '.join(artists[:-1])} & {artists[-1]}"
     
+    def clean_title(self) -> str:
+        """
+        Get the track name without featured artists or bracketed suffixes.
+        
+        Returns:
+            str: The cleaned track name, e.g. "Song" for "Song (feat. X) [Remastered]"
+        """
+        return self._clean_title
+    
     def get_search_query(self) -> str:
         """
         Get a search query string for finding this track on other platforms.
@@ -105,4 +224,4 @@ class Track:
         Returns:
             str: A search query string combining track name and artist
         """
-        return f"{self.name} {self.artist}"
\ No newline at end of file
+        return self._search_query
\ No newline at end of file
@@ -7,24 +7,37 @@ This module implements the AppleMusicService class for interacting with the Appl
 import os
 import logging
 import time
-import json
 from typing import Dict, List, Optional, Tuple, Any, Union
 
+import orjson
 import requests
 import jwt
 from datetime import datetime, timedelta
 
 from models.track import Track
 from models.playlist import Playlist
+from .base import EMPTY, RETRY, SEARCH_WORKERS, TrackSearchMixin, year_from_date
+from .ratelimit import RateLimitedAdapter, get_limiter
 
 logger = logging.getLogger(__name__)
 
+# Prefix of the platform URIs given to Apple Music tracks
+_URI_PREFIX = "apple_music:track:"
 
-class AppleMusicService:
+
+class AppleMusicService(TrackSearchMixin):
     """
     Service for interacting with the Apple Music API.
     """
     
+    # Platform name used in track URIs and platform IDs, and its name in logs
+    platform = 'apple_music'
+    display_name = 'Apple Music'
+    
+    # Maximum number of song IDs per catalog lookup, and of ISRCs per ISRC filter
+    ID_LOOKUP_SIZE = 100
+    ISRC_LOOKUP_SIZE = 25
+    
     def __init__(self, developer_token: str, user_token: Optional[str] = None):
         """
         Initialize the Apple Music service.
@@ -37,6 +50,38 @@ class AppleMusicService:
         self.user_token = user_token
         self.base_url = "https://api.music.apple.com/v1"
         self.storefront = "us"  # Default storefront
+        self._session: Optional[requests.Session] = None
+        self._user_headers = {"Music-User-Token": user_token} if user_token else None
+        
+        self._memoize_searches()
+    
+    def _get_session(self) -> requests.Session:
+        """
+        Get the HTTP session, creating it on first use.
+        
+        The session keeps connections to the API alive between calls, so only
+        the first request pays for the TCP and TLS handshake. It also carries
+        the developer token headers, so they are built once rather than per call.
+        
+        Returns:
+            requests.Session: The shared session
+        """
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update({
+                "Authorization": f"Bearer {self.developer_token}",
+                "Content-Type": "application/json"
+            })
+            self._session.mount("https://", RateLimitedAdapter(
+                get_limiter('apple_music'), pool_connections=1, pool_maxsize=SEARCH_WORKERS, max_retries=RETRY
+            ))
+        return self._session
+    
+    def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
     
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, 
                      data: Optional[Dict[str, Any]] = None, user_token: bool = False) -> Optional[Dict[str, Any]]:
@@ -55,16 +100,11 @@ class AppleMusicService:
         """
         url = f"{self.base_url}/{endpoint}"
         
-        headers = {
-            "Authorization": f"Bearer {self.developer_token}",
-            "Content-Type": "application/json"
-        }
-        
-        if user_token and self.user_token:
-            headers["Music-User-Token"] = self.user_token
+        # Only user-scoped calls add a header on top of the session's base headers
+        headers = self._user_headers if user_token else None
         
         try:
-            response = requests.request(
+            response = self._get_session().request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -73,7 +113,8 @@ class AppleMusicService:
             )
             
             response.raise_for_status()
-            return response.json()
+            # orjson parses the (often multi-megabyte) body much faster than stdlib json
+            return orjson.loads(response.content)
         
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP error making Apple Music API request: {str(e)}")
@@ -98,8 +139,9 @@ class AppleMusicService:
             if not playlist_id.startswith('pl.'):
                 playlist_id = f"pl.{playlist_id}"
             
-            # Get playlist details
             endpoint = f"catalog/{self.storefront}/playlists/{playlist_id}"
+            
+            # Get playlist details
             response = self._make_request("GET", endpoint, params={"include": "tracks"})
             
             if not response or 'data' not in response:
@@ -131,30 +173,10 @@ class AppleMusicService:
             relationships = playlist_data.get('relationships', {})
             tracks_data = relationships.get('tracks', {}).get('data', [])
             
-            # Convert tracks to Track objects
+            # Convert tracks to Track objects, skipping entries without attributes
             for track_data in tracks_data:
-                attrs = track_data.get('attributes', {})
-                
-                # Skip if no attributes
-                if not attrs:
-                    continue
-                
-                # Create Track object
-                track = Track(
-                    name=attrs.get('name', 'Unknown Track'),
-                    artist=attrs.get('artistName', 'Unknown Artist'),
-                    album=attrs.get('albumName', ''),
-                    duration_ms=int(attrs.get('durationInMillis', 0)),
-                    isrc=attrs.get('isrc'),
-                    uri={'apple_music': f"apple_music:track:{track_data.get('id')}"},
-                    platform_ids={'apple_music': track_data.get('id')},
-                    release_year=int(attrs.get('releaseDate', '0000')[:4]) 
-                        if attrs.get('releaseDate') else None,
-                    album_art_url=attrs.get('artwork', {}).get('url'),
-                    explicit=attrs.get('contentRating') == 'explicit'
-                )
-                
-                playlist.add_track(track)
+                if track_data.get('attributes'):
+                    playlist.add_track(self._apple_music_track_to_track(track_data))
             
             logger.info(f"Retrieved Apple Music playlist '{playlist.name}' with {len(playlist.tracks)} tracks")
             return playlist
@@ -163,59 +185,101 @@ class AppleMusicService:
             logger.error(f"Error getting Apple Music playlist: {str(e)}")
             return None
     
-    def search_track(self, track: Track) -> Optional[Track]:
+    def _search_by_isrc(self, isrc: str) -> Optional[Track]:
         """
-        Search for a track on Apple Music.
+        Search for a track by ISRC. Memoized per instance in __init__.
         
         Args:
-            track: Track object to search for
+            isrc: ISRC to search for
             
         Returns:
             Track object with Apple Music details or None if not found
+            
+        Raises:
+            LookupError: If the request failed, so the failure is not memoized
         """
-        try:
-            # Try to find by ISRC first (most accurate)
-            if track.isrc:
-                query = f"isrc:{track.isrc}"
-                endpoint = f"catalog/{self.storefront}/songs"
-                response = self._make_request("GET", endpoint, params={
-                    "filter[isrc]": track.isrc,
-                    "limit": 1
-                })
-                
-                if response and response.get('data'):
-                    track_data = response['data'][0]
-                    return self._apple_music_track_to_track(track_data)
-            
-            # Try by track name and artist
-            query = f"{track.name} {track.artist}"
-            endpoint = f"catalog/{self.storefront}/search"
-            response = self._make_request("GET", endpoint, params={
-                "term": query,
-                "types": "songs",
-                "limit": 10
-            })
+        endpoint = f"catalog/{self.storefront}/songs"
+        response = self._make_request("GET", endpoint, params={
+            "filter[isrc]": isrc,
+            "limit": 1
+        })
+        
+        if response is None:
+            raise LookupError(f"Apple Music ISRC lookup failed: {isrc}")
+        
+        data = response.get('data')
+        return self._apple_music_track_to_track(data[0]) if data else None
+    
+    def _search_by_name(self, name: str, artist: str) -> Optional[Track]:
+        """
+        Search for a track by name and artist. Memoized per instance in __init__.
+        
+        Args:
+            name: Track name
+            artist: Primary artist name
             
-            # Find best match
-            if response and response.get('results', {}).get('songs', {}).get('data'):
-                songs = response['results']['songs']['data']
-                
-                for song in songs:
-                    attrs = song.get('attributes', {})
-                    
-                    # Check if this is a good match
-                    if (attrs.get('name', '').lower() == track.name.lower() and
-                            attrs.get('artistName', '').lower() == track.artist.lower()):
-                        return self._apple_music_track_to_track(song)
-                
-                # If no exact match, return the first result
-                return self._apple_music_track_to_track(songs[0])
+        Returns:
+            Track object with Apple Music details or None if not found
             
+        Raises:
+            LookupError: If the request failed, so the failure is not memoized
+        """
+        endpoint = f"catalog/{self.storefront}/search"
+        response = self._make_request("GET", endpoint, params={
+            "term": f"{name} {artist}",
+            "types": "songs",
+            "limit": 10
+        })
+        
+        if response is None:
+            raise LookupError(f"Apple Music search failed: {name} {artist}")
+        
+        songs = ((response.get('results') or EMPTY).get('songs') or EMPTY).get('data')
+        if not songs:
             return None
+        
+        # Find best match
+        name_lower, artist_lower = name.lower(), artist.lower()
+        for song in songs:
+            attrs = song.get('attributes') or EMPTY
             
-        except Exception as e:
-            logger.error(f"Error searching Apple Music track: {str(e)}")
-            return None
+            # Check if this is a good match
+            if (attrs.get('name', '').lower() == name_lower and
+                    attrs.get('artistName', '').lower() == artist_lower):
+                return self._apple_music_track_to_track(song)
+        
+        # If no exact match, return the first result
+        return self._apple_music_track_to_track(songs[0])
+    
+    def _lookup_isrcs(self, isrcs: List[str]) -> List[Track]:
+        """
+        Fetch one batch of catalog songs by ISRC with a single filter call.
+        
+        Args:
+            isrcs: At most 25 ISRCs
+            
+        Returns:
+            The tracks found for any of the ISRCs
+        """
+        endpoint = f"catalog/{self.storefront}/songs"
+        response = self._make_request("GET", endpoint, params={"filter[isrc]": ",".join(isrcs)})
+        
+        return [self._apple_music_track_to_track(track_data) for track_data in (response or EMPTY).get('data') or ()]
+    
+    def _lookup_ids(self, track_ids: List[str]) -> List[Track]:
+        """
+        Fetch one batch of catalog songs by Apple Music ID.
+        
+        Args:
+            track_ids: At most 100 Apple Music catalog song IDs
+            
+        Returns:
+            The tracks that were found
+        """
+        endpoint = f"catalog/{self.storefront}/songs"
+        response = self._make_request("GET", endpoint, params={"ids": ",".join(track_ids)})
+        
+        return [self._apple_music_track_to_track(track_data) for track_data in (response or EMPTY).get('data') or ()]
     
     def create_playlist(self, name: str, description: str, tracks: List[Track]) -> Optional[Playlist]:
         """
@@ -239,7 +303,7 @@ class AppleMusicService:
             # Get track IDs
             track_ids = []
             for track in tracks:
-                track_id = track.platform_ids.get('apple_music')
+                track_id = track.get_platform_id('apple_music')
                 if track_id:
                     track_ids.append({
                         "id": track_id,
@@ -303,7 +367,10 @@ class AppleMusicService:
         Returns:
             Track object
         """
-        attrs = track_data.get('attributes', {})
+        # Bind nested objects once; missing ones fall back to a shared empty sentinel
+        attrs = track_data.get('attributes') or EMPTY
+        artwork = attrs.get('artwork') or EMPTY
+        track_id = track_data.get('id')
         
         return Track(
             name=attrs.get('name', 'Unknown Track'),
@@ -311,10 +378,9 @@ class AppleMusicService:
             album=attrs.get('albumName', ''),
             duration_ms=int(attrs.get('durationInMillis', 0)),
             isrc=attrs.get('isrc'),
-            uri={'apple_music': f"apple_music:track:{track_data.get('id')}"},
-            platform_ids={'apple_music': track_data.get('id')},
-            release_year=int(attrs.get('releaseDate', '0000')[:4]) 
-                if attrs.get('releaseDate') else None,
-            album_art_url=attrs.get('artwork', {}).get('url'),
+            uri={'apple_music': _URI_PREFIX + track_id} if track_id else None,
+            platform_ids={'apple_music': track_id} if track_id else None,
+            release_year=year_from_date(attrs.get('releaseDate')),
+            album_art_url=artwork.get('url'),
             explicit=attrs.get('contentRating') == 'explicit'
-        )
\ No newline at end of file
+        )
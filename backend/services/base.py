@@ -0,0 +1,245 @@
+"""
+Service Helpers
+
+This module holds the pieces shared by the platform service implementations:
+the HTTP retry policy, common constants and the batched track search.
+"""
+
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from urllib3.util.retry import Retry
+
+from models.track import Track
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of track searches in flight at once in search_tracks
+SEARCH_WORKERS = 16
+
+# Maximum number of memoized search results per service instance
+SEARCH_CACHE_SIZE = 8192
+
+# Retry throttled (429) and transient server errors with exponential backoff,
+# waiting as long as the API asks via Retry-After
+RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Shared read-only default for missing nested objects in API responses
+EMPTY: Dict[str, Any] = {}
+
+
+def year_from_date(date: Optional[str]) -> Optional[int]:
+    """Get the year from an ISO release date ("2001", "2001-05" or "2001-05-14")."""
+    return int(date[:4]) if date and date[:4].isdigit() else None
+
+
+class TrackSearchMixin:
+    """
+    Track search shared by the platform services.
+    
+    A service sets `platform`, `display_name`, `ID_LOOKUP_SIZE` and
+    `ISRC_LOOKUP_SIZE`, calls `_memoize_searches` from its constructor and
+    implements the platform primitives: `_search_by_isrc`, `_search_by_name`,
+    `_lookup_ids` and `_lookup_isrcs`. `_search_by_isrc` and `_search_by_name` may raise
+    LookupError for a failed request, so the failure is not memoized.
+    """
+    
+    # Platform name used in track URIs and platform IDs, and its name in logs
+    platform: str
+    display_name: str
+    
+    # Maximum number of track IDs per `_lookup_ids` call, and of ISRCs per
+    # `_lookup_isrcs` call
+    ID_LOOKUP_SIZE: int
+    ISRC_LOOKUP_SIZE: int
+    
+    def _memoize_searches(self) -> None:
+        """Memoize searches so a track repeated in a playlist is only looked up once."""
+        self._search_by_isrc = functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)(self._search_by_isrc)
+        self._search_by_name = functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)(self._search_by_name)
+    
+    def _ensure_client(self) -> None:
+        """Set up the API client if the service creates it lazily."""
+    
+    def search_track(self, track: Track) -> Optional[Track]:
+        """
+        Search for a track on the platform.
+        
+        Args:
+            track: Track object to search for
+            
+        Returns:
+            Matching Track object or None if not found
+        """
+        try:
+            self._ensure_client()
+            
+            # A track that is already on the platform only needs its details fetched
+            track_id = track.get_platform_id(self.platform)
+            if track_id:
+                match = self.get_tracks_by_id([track_id]).get(track_id)
+                if match:
+                    return match
+            
+            # Try to find by ISRC first (most accurate); a failed lookup falls
+            # through to the name search
+            if track.isrc:
+                try:
+                    match = self._search_by_isrc(track.isrc)
+                except LookupError:
+                    match = None
+                if match:
+                    return match
+            
+            # Try by track name and artist
+            return self._search_by_name(track.name, track.artist)
+            
+        except Exception as e:
+            logger.error(f"Error searching {self.display_name} track: {str(e)}")
+            return None
+    
+    def _search_text(self, track: Track) -> Optional[Track]:
+        """
+        Search for a track by name and artist only.
+        
+        Used by `search_tracks` for tracks whose platform ID and ISRC were
+        already looked up in bulk, so `search_track` would repeat those calls.
+        
+        Args:
+            track: Track object to search for
+            
+        Returns:
+            Matching Track object or None if not found
+        """
+        try:
+            self._ensure_client()
+            return self._search_by_name(track.name, track.artist)
+            
+        except Exception as e:
+            logger.error(f"Error searching {self.display_name} track: {str(e)}")
+            return None
+    
+    def search_tracks(self, tracks: List[Track]) -> List[Optional[Track]]:
+        """
+        Search for many tracks on the platform concurrently.
+        
+        Tracks that already carry a platform ID are fetched in bulk through
+        `get_tracks_by_id`, and tracks with an ISRC are resolved in bulk through
+        `bulk_lookup_by_isrc`. The remaining tracks only need a text search;
+        those are independent blocking API calls, so they are spread over a
+        bounded thread pool instead of being issued one after another.
+        
+        Args:
+            tracks: Track objects to search for
+            
+        Returns:
+            List of matching Track objects (None where not found), in input order
+        """
+        if not tracks:
+            return []
+        
+        # Resolve known IDs and ISRCs in bulk first; only the rest need a search each
+        ids = [track.get_platform_id(self.platform) for track in tracks]
+        known = self.get_tracks_by_id([track_id for track_id in ids if track_id])
+        isrc_matches = self.bulk_lookup_by_isrc([
+            track.isrc for track, track_id in zip(tracks, ids) if track.isrc and track_id not in known
+        ])
+        results: List[Optional[Track]] = [
+            known.get(track_id) or (isrc_matches.get(track.isrc) if track.isrc else None)
+            for track, track_id in zip(tracks, ids)
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(pending))) as executor:
+                for i, result in zip(pending, executor.map(self._search_text, [tracks[i] for i in pending])):
+                    results[i] = result
+        
+        return results
+    
+    def get_tracks_by_id(self, track_ids: List[str]) -> Dict[str, Track]:
+        """
+        Fetch many tracks by platform ID with one call per `ID_LOOKUP_SIZE` IDs.
+        
+        Args:
+            track_ids: Platform track IDs
+            
+        Returns:
+            Dictionary mapping each ID that was found to its Track
+        """
+        found: Dict[str, Track] = {}
+        ids = list(dict.fromkeys(track_id for track_id in track_ids if track_id))
+        
+        try:
+            self._ensure_client()
+            
+            for i in range(0, len(ids), self.ID_LOOKUP_SIZE):
+                for track in self._lookup_ids(ids[i:i+self.ID_LOOKUP_SIZE]):
+                    found[track.get_platform_id(self.platform)] = track
+            
+        except Exception as e:
+            logger.error(f"Error getting {self.display_name} tracks by ID: {str(e)}")
+        
+        return found
+    
+    def _lookup_ids(self, track_ids: List[str]) -> List[Track]:
+        """
+        Fetch one batch of tracks by platform ID; unknown IDs are left out.
+        
+        Args:
+            track_ids: At most `ID_LOOKUP_SIZE` platform track IDs
+            
+        Returns:
+            The tracks that were found
+        """
+        raise NotImplementedError
+    
+    def bulk_lookup_by_isrc(self, isrcs: List[str]) -> Dict[str, Track]:
+        """
+        Look up many tracks by ISRC with one call per `ISRC_LOOKUP_SIZE` ISRCs.
+        
+        Args:
+            isrcs: ISRCs to look up
+            
+        Returns:
+            Dictionary mapping each ISRC that was found to its Track
+        """
+        found: Dict[str, Track] = {}
+        # Platforms report ISRCs upper-case; map them back to the caller's spelling
+        wanted = {isrc.upper(): isrc for isrc in isrcs if isrc}
+        keys = list(wanted)
+        
+        try:
+            self._ensure_client()
+            
+            for i in range(0, len(keys), self.ISRC_LOOKUP_SIZE):
+                # An ISRC can map to several tracks; keep the first one
+                for track in self._lookup_isrcs(keys[i:i+self.ISRC_LOOKUP_SIZE]):
+                    key = wanted.get(track.isrc.upper()) if track.isrc else None
+                    if key is not None and key not in found:
+                        found[key] = track
+            
+        except Exception as e:
+            logger.error(f"Error looking up {self.display_name} tracks by ISRC: {str(e)}")
+        
+        return found
+    
+    def _lookup_isrcs(self, isrcs: List[str]) -> List[Track]:
+        """
+        Fetch one batch of tracks by ISRC.
+        
+        Args:
+            isrcs: At most `ISRC_LOOKUP_SIZE` upper-case ISRCs
+            
+        Returns:
+            The tracks found for any of the ISRCs
+        """
+        raise NotImplementedError
@@ -0,0 +1,244 @@
+"""
+Disk Cache
+
+This module implements a small persistent cache used by the services to keep
+API results across requests and process restarts.
+"""
+
+import os
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the cache databases
+CACHE_DIR = os.path.expanduser(os.getenv('BEATBRIDGE_CACHE_DIR', '~/.cache/beatbridge'))
+
+# Keys per lookup query in get_many, well below SQLite's limit on query parameters
+GET_MANY_BATCH_SIZE = 500
+
+# Minimum time between purges of expired entries, in seconds
+PURGE_INTERVAL = 60 * 60
+
+# How long a cached playlist is kept, in seconds
+PLAYLIST_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+class DiskCache:
+    """
+    Pickle-backed key/value store in a SQLite file.
+
+    Each entry carries an optional version string (an ETag, snapshot ID or
+    last-modified date) so callers can revalidate it cheaply against the API.
+    The cache never raises: if the database cannot be opened or written, it
+    logs a warning and behaves as if empty.
+
+    If `max_age` is given, entries older than that are purged on the first
+    write in a process and then at most once every `PURGE_INTERVAL` seconds.
+    """
+
+    def __init__(self, name: str, directory: str = CACHE_DIR, max_age: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            name: Name of the cache; used as the database file name
+            directory: Directory holding the database file
+            max_age: Age after which entries are purged, in seconds; None keeps them
+        """
+        self.path = os.path.join(directory, f"{name}.sqlite3")
+        self.max_age = max_age
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disabled = False
+        self._next_purge = 0.0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use. Must be called with the lock held."""
+        if self._conn is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache "
+                    "(key TEXT PRIMARY KEY, version TEXT, value BLOB NOT NULL, stored_at REAL)"
+                )
+                # Databases created before entries were timestamped lack the column
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+                if 'stored_at' not in columns:
+                    conn.execute("ALTER TABLE cache ADD COLUMN stored_at REAL")
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Disk cache {self.path} unavailable: {str(e)}")
+                self._disabled = True
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], Any]]:
+        """
+        Get an entry from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (version, value), or None if the key is not cached
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT version, value FROM cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading disk cache {self.path}: {str(e)}")
+                return None
+
+        if row is None:
+            return None
+
+        try:
+            return row[0], pickle.loads(row[1])
+        except Exception as e:
+            logger.warning(f"Discarding unreadable disk cache entry {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, value: Any, version: Optional[str] = None) -> None:
+        """
+        Store an entry in the cache, replacing any previous value.
+
+        Args:
+            key: Cache key
+            value: Picklable value to store
+            version: Version string used to revalidate the entry
+        """
+        self._purge_due()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (key, version, value, stored_at) VALUES (?, ?, ?, ?)",
+                        (key, version, blob, time.time())
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing disk cache {self.path}: {str(e)}")
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[Optional[str], Any]]:
+        """
+        Get several entries from the cache with one query.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary mapping each cached key to its (version, value)
+        """
+        if not keys:
+            return {}
+
+        rows = []
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return {}
+            try:
+                for i in range(0, len(keys), GET_MANY_BATCH_SIZE):
+                    batch = keys[i:i+GET_MANY_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows.extend(conn.execute(
+                        f"SELECT key, version, value FROM cache WHERE key IN ({placeholders})", batch
+                    ).fetchall())
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading disk cache {self.path}: {str(e)}")
+                return {}
+
+        entries = {}
+        for key, version, blob in rows:
+            try:
+                entries[key] = version, pickle.loads(blob)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable disk cache entry {key}: {str(e)}")
+        return entries
+
+    def set_many(self, items: Dict[str, Any], version: Optional[str] = None) -> None:
+        """
+        Store several entries in the cache in one transaction.
+
+        Args:
+            items: Dictionary mapping cache keys to picklable values
+            version: Version string stored with every entry
+        """
+        if not items:
+            return
+
+        self._purge_due()
+        stored_at = time.time()
+        rows = [
+            (key, version, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), stored_at)
+            for key, value in items.items()
+        ]
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO cache (key, version, value, stored_at) VALUES (?, ?, ?, ?)", rows
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing disk cache {self.path}: {str(e)}")
+
+    def purge(self, max_age: float) -> None:
+        """
+        Delete entries stored more than `max_age` seconds ago.
+
+        Entries written before timestamps were recorded are deleted too.
+
+        Args:
+            max_age: Maximum entry age, in seconds
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    deleted = conn.execute(
+                        "DELETE FROM cache WHERE stored_at IS NULL OR stored_at < ?",
+                        (time.time() - max_age,)
+                    ).rowcount
+            except sqlite3.Error as e:
+                logger.warning(f"Error purging disk cache {self.path}: {str(e)}")
+                return
+
+        if deleted:
+            logger.info(f"Purged {deleted} expired entries from disk cache {self.path}")
+
+    def _purge_due(self) -> None:
+        """Purge entries past `max_age` if `PURGE_INTERVAL` has passed since the last purge."""
+        if self.max_age is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_purge:
+                return
+            self._next_purge = now + PURGE_INTERVAL
+
+        self.purge(self.max_age)
+
+
+# Playlists fetched before, shared by every service and revalidated by the caller
+playlist_cache = DiskCache('playlists', max_age=PLAYLIST_CACHE_MAX_AGE)
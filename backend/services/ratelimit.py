@@ -0,0 +1,157 @@
+"""
+Rate Limiting
+
+This module implements the token-bucket rate limiters that pace the services'
+outbound API calls.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Sustained requests per second and burst size for each platform's API
+RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    'spotify': (10.0, 20),
+    'apple_music': (20.0, 40),
+    'youtube_music': (40.0, 40)
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `burst`; each call
+    to `acquire` takes one, waiting only as long as it takes to refill.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens held
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, blocking until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            # Sleep outside the lock so other threads can refill and check
+            time.sleep(wait)
+
+
+class PacedRetry(Retry):
+    """
+    Retry policy that takes a token from a bucket before every retry.
+
+    urllib3 retries throttled and failed requests inside the connection pool,
+    below the adapter's `send`, so without this the retries would skip the
+    bucket and a burst of 429s would be retried at full speed.
+    """
+
+    limiter: Optional[TokenBucket] = None
+
+    @classmethod
+    def wrap(cls, retry: Retry, limiter: TokenBucket) -> 'PacedRetry':
+        """
+        Copy a retry policy into one paced by a bucket.
+
+        Args:
+            retry: Policy to copy
+            limiter: Bucket each retry takes a token from
+
+        Returns:
+            PacedRetry: The paced copy
+        """
+        paced = cls.__new__(cls)
+        paced.__dict__.update(vars(retry))
+        paced.limiter = limiter
+        return paced
+
+    def new(self, **kw) -> 'PacedRetry':
+        """Copy the policy with updated counters, keeping the bucket."""
+        retry = super().new(**kw)
+        retry.limiter = self.limiter
+        return retry
+
+    def increment(self, *args, **kwargs) -> 'PacedRetry':
+        """Count a retry and take a token for the attempt that follows it."""
+        retry = super().increment(*args, **kwargs)
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return retry
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTP adapter that takes a token from a bucket before sending each request,
+    and before each of urllib3's retries of it.
+    """
+
+    def __init__(self, limiter: TokenBucket, **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            limiter: Bucket paced by this adapter's requests
+            **kwargs: Passed to HTTPAdapter
+        """
+        self.limiter = limiter
+        super().__init__(**kwargs)
+        self.max_retries = PacedRetry.wrap(self.max_retries, limiter)
+
+    def send(self, request, **kwargs):
+        """
+        Send a request once a token is available.
+
+        Args:
+            request: The PreparedRequest to send
+            **kwargs: Passed to HTTPAdapter.send
+
+        Returns:
+            requests.Response: The response
+        """
+        self.limiter.acquire()
+        return super().send(request, **kwargs)
+
+
+# One bucket per platform, shared by every service instance in the process
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(platform: str) -> TokenBucket:
+    """
+    Get the shared rate limiter for a platform.
+
+    Args:
+        platform: Platform name ('spotify', 'apple_music' or 'youtube_music')
+
+    Returns:
+        TokenBucket: The platform's limiter
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(platform)
+        if limiter is None:
+            limiter = _limiters[platform] = TokenBucket(*RATE_LIMITS[platform])
+        return limiter
@@ -7,7 +7,9 @@ This module implements the SpotifyService class for interacting with the Spotify
 import os
 import logging
 import time
-from typing import Dict, List, Optional, Tuple, Any, Union
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Any, Union
 
 import requests
 import spotipy
@@ -15,15 +17,75 @@ from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOAuth
 
 from models.track import Track
 from models.playlist import Playlist
+from .cache import playlist_cache
+from .base import EMPTY, RETRY, SEARCH_WORKERS, TrackSearchMixin, year_from_date
+from .ratelimit import RateLimitedAdapter, get_limiter
 
 logger = logging.getLogger(__name__)
 
+# Writes are retried too, matching the policy spotipy applies to the
+# sessions it builds itself
+_RETRY = RETRY.new(allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']))
 
-class SpotifyService:
+# Playlist items per page, and how many pages to fetch at once
+PAGE_SIZE = 100
+PAGE_WORKERS = 8
+
+# Maximum number of tracks per playlist_add_items call
+ADD_BATCH_SIZE = 100
+
+# Maximum number of ISRCs or track IDs per bulk lookup (Spotify's page limit)
+BULK_LOOKUP_SIZE = 50
+
+
+def _build_session() -> requests.Session:
+    """Build a rate-limited HTTP session whose pool can serve every search_tracks worker."""
+    session = requests.Session()
+    session.mount("https://", RateLimitedAdapter(
+        get_limiter('spotify'), pool_connections=1, pool_maxsize=SEARCH_WORKERS, max_retries=_RETRY
+    ))
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _app_client(client_id: Optional[str], client_secret: Optional[str]) -> spotipy.Spotify:
+    """
+    Get the client-credentials Spotify client for a set of app credentials.
+    
+    The client is built once and shared by every SpotifyService, so its
+    access token and kept-alive connections survive across service instances
+    instead of being re-negotiated per request. Token refreshes go through
+    the same connection pool as API calls.
+    
+    Args:
+        client_id: Spotify app client ID
+        client_secret: Spotify app client secret
+        
+    Returns:
+        spotipy.Spotify: The shared client
+    """
+    session = _build_session()
+    auth_manager = SpotifyClientCredentials(
+        client_id=client_id,
+        client_secret=client_secret,
+        requests_session=session
+    )
+    return spotipy.Spotify(auth_manager=auth_manager, requests_session=session)
+
+
+class SpotifyService(TrackSearchMixin):
     """
     Service for interacting with the Spotify Web API.
     """
     
+    # Platform name used in track URIs and platform IDs, and its name in logs
+    platform = 'spotify'
+    display_name = 'Spotify'
+    
+    # Maximum number of track IDs per tracks() call, and of ISRCs per search
+    ID_LOOKUP_SIZE = BULK_LOOKUP_SIZE
+    ISRC_LOOKUP_SIZE = BULK_LOOKUP_SIZE
+    
     def __init__(self, access_token: Optional[str] = None):
         """
         Initialize the Spotify service.
@@ -37,6 +99,8 @@ class SpotifyService:
         self.access_token = access_token
         self.sp = None
         
+        self._memoize_searches()
+        
         self._initialize_client()
     
     def _initialize_client(self) -> None:
@@ -44,43 +108,68 @@ class SpotifyService:
         try:
             if self.access_token:
                 # Use provided access token for user-specific operations
-                self.sp = spotipy.Spotify(auth=self.access_token)
+                self.sp = spotipy.Spotify(auth=self.access_token, requests_session=_build_session())
                 logger.info("Initialized Spotify client with user access token")
             else:
-                # Use client credentials for general operations
-                auth_manager = SpotifyClientCredentials(
-                    client_id=self.client_id,
-                    client_secret=self.client_secret
-                )
-                self.sp = spotipy.Spotify(auth_manager=auth_manager)
+                # Use the shared client-credentials client for general operations
+                self.sp = _app_client(self.client_id, self.client_secret)
                 logger.info("Initialized Spotify client with client credentials")
-                
-            # Test the client
-            self.sp.current_user() if self.access_token else self.sp.recommendation_genre_seeds()
             
         except Exception as e:
             logger.error(f"Failed to initialize Spotify client: {str(e)}")
             self.sp = None
             raise
     
-    def _handle_pagination(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def validate(self) -> None:
         """
-        Handle Spotify API pagination.
+        Check the credentials with a lightweight API call.
+        
+        Construction does not touch the network; call this at startup when
+        invalid credentials should fail fast instead of on first use.
+        
+        Raises:
+            spotipy.SpotifyException: If the API rejects the access token
+            spotipy.oauth2.SpotifyOauthError: If the app credentials are invalid
+        """
+        if not self.sp:
+            self._initialize_client()
+        
+        self.sp.current_user() if self.access_token else self.sp.recommendation_genre_seeds()
+    
+    def _iter_pages(self, results: Dict[str, Any], playlist_id: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Handle Spotify API pagination, yielding one page of items at a time.
+        
+        The first page gives the total, so every remaining page is requested
+        concurrently by offset as soon as the first one is yielded. Callers
+        convert each page while the following pages are still downloading.
         
         Args:
-            results: Initial response from Spotify API
+            results: Initial page of playlist items from Spotify API
+            playlist_id: Spotify playlist ID the page belongs to
             
-        Returns:
-            List of items from all pages
+        Yields:
+            The items of each page, in playlist order
         """
-        items = results['items']
+        if not results.get('next'):
+            yield results['items']
+            return
         
-        # Continue fetching if there are more pages
-        while results['next']:
-            results = self.sp.next(results)
-            items.extend(results['items'])
+        limit = results.get('limit') or PAGE_SIZE
+        offsets = range(results.get('offset', 0) + limit, results['total'], limit)
         
-        return items
+        def fetch_page(offset: int) -> List[Dict[str, Any]]:
+            page = self.sp.playlist_items(playlist_id, limit=limit, offset=offset, additional_types=('track',))
+            return page['items']
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(PAGE_WORKERS, len(offsets))))
+        try:
+            # map() submits every fetch up front and yields pages in offset order
+            pages = executor.map(fetch_page, offsets)
+            yield results['items']
+            yield from pages
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def get_playlist(self, playlist_id: str) -> Optional[Playlist]:
         """
@@ -96,6 +185,15 @@ class SpotifyService:
             if not self.sp:
                 self._initialize_client()
             
+            # Reuse the cached copy if the playlist's snapshot has not changed
+            cache_key = f"spotify:{playlist_id}"
+            cached = playlist_cache.get(cache_key)
+            if cached:
+                snapshot_id = self.sp.playlist(playlist_id, fields='snapshot_id').get('snapshot_id')
+                if snapshot_id and snapshot_id == cached[0]:
+                    logger.info(f"Using cached Spotify playlist {playlist_id} (snapshot unchanged)")
+                    return cached[1]
+            
             # Get playlist details
             playlist_data = self.sp.playlist(playlist_id)
             
@@ -113,41 +211,19 @@ class SpotifyService:
                 collaborative=playlist_data.get('collaborative', False)
             )
             
-            # Get all tracks (handle pagination)
-            track_items = self._handle_pagination(playlist_data['tracks'])
-            
-            # Convert tracks to Track objects
-            for item in track_items:
-                if not item.get('track'):
-                    continue
+            # Convert tracks to Track objects page by page, while later pages download
+            for page in self._iter_pages(playlist_data['tracks'], playlist_id):
+                for item in page:
+                    track_data = item.get('track')
                     
-                track_data = item['track']
-                
-                # Skip local files or tracks without IDs (can't be transferred)
-                if track_data.get('is_local') or not track_data.get('id'):
-                    continue
-                
-                # Create Track object
-                track = Track(
-                    name=track_data['name'],
-                    artist=track_data['artists'][0]['name'] if track_data.get('artists') else 'Unknown',
-                    album=track_data['album']['name'] if track_data.get('album') else '',
-                    duration_ms=track_data.get('duration_ms', 0),
-                    isrc=track_data.get('external_ids', {}).get('isrc'),
-                    uri={'spotify': track_data['uri']},
-                    platform_ids={'spotify': track_data['id']},
-                    additional_artists=[
-                        artist['name'] for artist in track_data.get('artists', [])[1:]
-                    ],
-                    release_year=int(track_data.get('album', {}).get('release_date', '0000')[:4]) 
-                        if track_data.get('album', {}).get('release_date') else None,
-                    album_art_url=track_data.get('album', {}).get('images', [{}])[0].get('url') 
-                        if track_data.get('album', {}).get('images') else None,
-                    explicit=track_data.get('explicit', False),
-                    popularity=track_data.get('popularity')
-                )
-                
-                playlist.add_track(track)
+                    # Skip local files or tracks without IDs (can't be transferred)
+                    if not track_data or track_data.get('is_local') or not track_data.get('id'):
+                        continue
+                    
+                    playlist.add_track(self._spotify_track_to_track(track_data))
+            
+            if playlist_data.get('snapshot_id'):
+                playlist_cache.set(cache_key, playlist, version=playlist_data['snapshot_id'])
             
             logger.info(f"Retrieved Spotify playlist '{playlist.name}' with {len(playlist.tracks)} tracks")
             return playlist
@@ -156,49 +232,81 @@ class SpotifyService:
             logger.error(f"Error getting Spotify playlist: {str(e)}")
             return None
     
-    def search_track(self, track: Track) -> Optional[Track]:
+    def _search_by_isrc(self, isrc: str) -> Optional[Track]:
         """
-        Search for a track on Spotify.
+        Search for a track by ISRC. Memoized per instance in __init__.
         
         Args:
-            track: Track object to search for
+            isrc: ISRC to search for
             
         Returns:
             Track object with Spotify details or None if not found
         """
-        try:
-            if not self.sp:
-                self._initialize_client()
-            
-            # Try to find by ISRC first (most accurate)
-            if track.isrc:
-                query = f"isrc:{track.isrc}"
-                results = self.sp.search(q=query, type='track', limit=1)
-                
-                if results['tracks']['items']:
-                    track_data = results['tracks']['items'][0]
-                    return self._spotify_track_to_track(track_data)
-            
-            # Try by track name and artist
-            query = f"track:{track.name} artist:{track.artist}"
-            results = self.sp.search(q=query, type='track', limit=10)
-            
-            # Find best match
-            if results['tracks']['items']:
-                for track_data in results['tracks']['items']:
-                    # Check if this is a good match
-                    if (track_data['name'].lower() == track.name.lower() and
-                            track_data['artists'][0]['name'].lower() == track.artist.lower()):
-                        return self._spotify_track_to_track(track_data)
-                
-                # If no exact match, return the first result
-                return self._spotify_track_to_track(results['tracks']['items'][0])
+        results = self.sp.search(q=f"isrc:{isrc}", type='track', limit=1)
+        items = results['tracks']['items']
+        return self._spotify_track_to_track(items[0]) if items else None
+    
+    def _search_by_name(self, name: str, artist: str) -> Optional[Track]:
+        """
+        Search for a track by name and artist. Memoized per instance in __init__.
+        
+        Args:
+            name: Track name
+            artist: Primary artist name
             
+        Returns:
+            Track object with Spotify details or None if not found
+        """
+        results = self.sp.search(q=f"track:{name} artist:{artist}", type='track', limit=10)
+        items = results['tracks']['items']
+        
+        if not items:
             return None
+        
+        # Find best match
+        name_lower, artist_lower = name.lower(), artist.lower()
+        for track_data in items:
+            # Check if this is a good match
+            if (track_data['name'].lower() == name_lower and
+                    track_data['artists'][0]['name'].lower() == artist_lower):
+                return self._spotify_track_to_track(track_data)
+        
+        # If no exact match, return the first result
+        return self._spotify_track_to_track(items[0])
+    
+    def _lookup_isrcs(self, isrcs: List[str]) -> List[Track]:
+        """
+        Fetch one batch of tracks by ISRC with a single search call.
+        
+        Args:
+            isrcs: At most 50 ISRCs
             
-        except Exception as e:
-            logger.error(f"Error searching Spotify track: {str(e)}")
-            return None
+        Returns:
+            The tracks found for any of the ISRCs
+        """
+        query = " OR ".join(f"isrc:{isrc}" for isrc in isrcs)
+        results = self.sp.search(q=query, type='track', limit=BULK_LOOKUP_SIZE)
+        return [self._spotify_track_to_track(track_data) for track_data in results['tracks']['items']]
+    
+    def _ensure_client(self) -> None:
+        """Initialize the Spotify client if it isn't set up yet."""
+        if not self.sp:
+            self._initialize_client()
+    
+    def _lookup_ids(self, track_ids: List[str]) -> List[Track]:
+        """
+        Fetch one batch of tracks by Spotify ID.
+        
+        Args:
+            track_ids: At most 50 Spotify track IDs
+            
+        Returns:
+            The tracks that were found
+        """
+        results = self.sp.tracks(track_ids)
+        
+        # Unknown IDs come back as null entries
+        return [self._spotify_track_to_track(track_data) for track_data in results['tracks'] if track_data]
     
     def create_playlist(self, name: str, description: str, tracks: List[Track]) -> Optional[Playlist]:
         """
@@ -239,18 +347,21 @@ class SpotifyService:
                 is_public=True
             )
             
-            # Add tracks to playlist (in batches of 100)
+            # Collect the URIs of the tracks that can be added
             track_uris = []
             
             for track in tracks:
-                uri = track.uri.get('spotify')
+                uri = track.get_uri('spotify')
                 if uri:
                     track_uris.append(uri)
                     playlist.add_track(track)
             
-            # Add tracks in batches
-            for i in range(0, len(track_uris), 100):
-                batch = track_uris[i:i+100]
+            # Add tracks in batches. The batches are sent one after another on the
+            # pooled connection rather than concurrently: a batch inserted at
+            # position i fails if the batches before it have not landed yet, and
+            # appending concurrently would scramble the track order
+            for i in range(0, len(track_uris), ADD_BATCH_SIZE):
+                batch = track_uris[i:i+ADD_BATCH_SIZE]
                 self.sp.playlist_add_items(playlist_data['id'], batch)
             
             logger.info(f"Created Spotify playlist '{name}' with {len(track_uris)} tracks")
@@ -270,21 +381,22 @@ class SpotifyService:
         Returns:
             Track object
         """
+        # Bind nested objects once; missing ones fall back to shared empty sentinels
+        artists = track_data.get('artists') or ()
+        album = track_data.get('album') or EMPTY
+        images = album.get('images') or ()
+        
         return Track(
             name=track_data['name'],
-            artist=track_data['artists'][0]['name'] if track_data.get('artists') else 'Unknown',
-            album=track_data['album']['name'] if track_data.get('album') else '',
+            artist=artists[0]['name'] if artists else 'Unknown',
+            album=album.get('name', ''),
             duration_ms=track_data.get('duration_ms', 0),
-            isrc=track_data.get('external_ids', {}).get('isrc'),
+            isrc=(track_data.get('external_ids') or EMPTY).get('isrc'),
             uri={'spotify': track_data['uri']},
             platform_ids={'spotify': track_data['id']},
-            additional_artists=[
-                artist['name'] for artist in track_data.get('artists', [])[1:]
-            ],
-            release_year=int(track_data.get('album', {}).get('release_date', '0000')[:4]) 
-                if track_data.get('album', {}).get('release_date') else None,
-            album_art_url=track_data.get('album', {}).get('images', [{}])[0].get('url') 
-                if track_data.get('album', {}).get('images') else None,
+            additional_artists=[artist['name'] for artist in artists[1:]] if len(artists) > 1 else None,
+            release_year=year_from_date(album.get('release_date')),
+            album_art_url=images[0].get('url') if images else None,
             explicit=track_data.get('explicit', False),
             popularity=track_data.get('popularity')
-        )
\ No newline at end of file
+        )
@@ -9,17 +9,67 @@ import logging
 import time
 import json
 import re
-from typing import Dict, List, Optional, Tuple, Any, Union
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Any, Union
 
+import httplib2
+import orjson
 import requests
+from cachetools import TTLCache
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+from googleapiclient.model import JsonModel
 from google.oauth2.credentials import Credentials
 
 from models.track import Track
 from models.playlist import Playlist
+from .cache import DiskCache
+from .ratelimit import get_limiter
 
 logger = logging.getLogger(__name__)
 
+# "Artist - Track", optionally followed by "(...)", "[...]" or "| ..."
+_TITLE_RE = re.compile(r'^(.*?)\s*[-:]\s*(.*?)(?:\s*[\(\[\|].*)?$')
+
+# Milliseconds per unit letter of an ISO 8601 video duration ("PT4M13S", "P1DT2H")
+_ISO_UNIT_MS = {'D': 86_400_000, 'H': 3_600_000, 'M': 60_000, 'S': 1_000}
+
+# Maximum number of video IDs per videos.list call (the API's limit)
+VIDEO_BATCH_SIZE = 50
+
+# Maximum number of videos.list lookups in flight while paging a playlist
+PAGE_WORKERS = 8
+
+# Maximum number of track searches in flight at once in search_tracks
+SEARCH_WORKERS = 8
+
+# How many video resources to keep, and for how long (seconds)
+VIDEO_CACHE_SIZE = 5000
+VIDEO_CACHE_TTL = 86400
+
+# Video resources kept on disk across restarts; bump the version when the
+# stored resource shape changes so older entries are ignored
+_video_disk_cache = DiskCache('youtube_videos')
+VIDEO_DISK_CACHE_VERSION = '1'
+
+
+class _OrjsonModel(JsonModel):
+    """JSON wire model that decodes API responses with orjson."""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Let the stock model handle anything that isn't JSON
+            return super().deserialize(content)
+        
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
 
 class YouTubeMusicService:
     """
@@ -28,6 +78,13 @@ class YouTubeMusicService:
     Note: YouTube Music doesn't have an official API, so we use the YouTube Data API.
     """
     
+    # Platform name used in track URIs and platform IDs
+    platform = 'youtube_music'
+    
+    # Video resources by ID, shared by all instances (TTLCache is not thread-safe)
+    _video_cache: TTLCache = TTLCache(maxsize=VIDEO_CACHE_SIZE, ttl=VIDEO_CACHE_TTL)
+    _video_cache_lock = threading.Lock()
+    
     def __init__(self, access_token: Optional[str] = None):
         """
         Initialize the YouTube Music service.
@@ -38,6 +95,8 @@ class YouTubeMusicService:
         self.api_key = os.getenv('YOUTUBE_API_KEY')
         self.access_token = access_token
         self.youtube = None
+        self._credentials: Optional[Credentials] = None
+        self._local = threading.local()
         
         self._initialize_client()
     
@@ -52,11 +111,12 @@ class YouTubeMusicService:
                     client_id=os.getenv('YOUTUBE_CLIENT_ID'),
                     client_secret=os.getenv('YOUTUBE_CLIENT_SECRET')
                 )
-                self.youtube = build('youtube', 'v3', credentials=credentials)
+                self.youtube = build('youtube', 'v3', credentials=credentials, model=_OrjsonModel())
+                self._credentials = credentials
                 logger.info("Initialized YouTube client with OAuth credentials")
             else:
                 # Use API key for general operations
-                self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+                self.youtube = build('youtube', 'v3', developerKey=self.api_key, model=_OrjsonModel())
                 logger.info("Initialized YouTube client with API key")
                 
         except Exception as e:
@@ -64,6 +124,29 @@ class YouTubeMusicService:
             self.youtube = None
             raise
     
+    def _execute(self, request: HttpRequest) -> Dict[str, Any]:
+        """
+        Execute an API request on the calling thread's own HTTP connection.
+        
+        httplib2 connections are not thread-safe, so requests issued from
+        worker threads must not share the client's default connection. Every
+        call is paced by the shared YouTube rate limiter.
+        
+        Args:
+            request: The API request to execute
+            
+        Returns:
+            The decoded API response
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = httplib2.Http()
+            if self._credentials is not None:
+                http = AuthorizedHttp(self._credentials, http=http)
+            self._local.http = http
+        get_limiter('youtube_music').acquire()
+        return request.execute(http=http)
+    
     def get_playlist(self, playlist_id: str) -> Optional[Playlist]:
         """
         Get a playlist from YouTube Music.
@@ -78,11 +161,13 @@ class YouTubeMusicService:
             if not self.youtube:
                 self._initialize_client()
             
-            # Get playlist details
-            playlist_response = self.youtube.playlists().list(
+            # Get playlist details; every list call asks only for the fields
+            # we read, which shrinks responses considerably
+            playlist_response = self._execute(self.youtube.playlists().list(
                 part="snippet,contentDetails,status",
-                id=playlist_id
-            ).execute()
+                id=playlist_id,
+                fields="items(id,snippet(title,description,channelTitle,thumbnails/high/url),status/privacyStatus)"
+            ))
             
             if not playlist_response.get('items'):
                 logger.error(f"Failed to get YouTube Music playlist: {playlist_id}")
@@ -105,71 +190,113 @@ class YouTubeMusicService:
                 is_public=playlist_data.get('status', {}).get('privacyStatus') == 'public'
             )
             
-            # Get playlist items (videos)
-            next_page_token = None
+            # Get playlist items (videos), one page at a time
+            for tracks in self._iter_playlist_tracks(playlist_id):
+                for track in tracks:
+                    playlist.add_track(track)
+            
+            logger.info(f"Retrieved YouTube Music playlist '{playlist.name}' with {len(playlist.tracks)} tracks")
+            return playlist
             
+        except Exception as e:
+            logger.error(f"Error getting YouTube Music playlist: {str(e)}")
+            return None
+    
+    def _iter_playlist_tracks(self, playlist_id: str) -> Iterator[List[Track]]:
+        """
+        Yield the tracks of a playlist one page at a time.
+        
+        Page tokens are opaque, so pages are listed one after another, but
+        each page's video lookup runs in the background while the next page
+        is being listed. Pages are yielded in playlist order as soon as their
+        videos arrive, so callers can start on them before paging finishes.
+        
+        Args:
+            playlist_id: YouTube playlist ID
+            
+        Yields:
+            The tracks of each page, in playlist order
+        """
+        pending: Deque[Tuple[List[Tuple[str, Dict[str, Any]]], Future]] = deque()
+        next_page_token = None
+        
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
             while True:
-                items_response = self.youtube.playlistItems().list(
+                items_response = self._execute(self.youtube.playlistItems().list(
                     part="snippet,contentDetails",
                     playlistId=playlist_id,
                     maxResults=50,
-                    pageToken=next_page_token
-                ).execute()
+                    pageToken=next_page_token,
+                    fields="nextPageToken,items(contentDetails/videoId,snippet/title)"
+                ))
                 
-                # Process items (videos)
-                for item in items_response.get('items', []):
-                    # Skip non-music videos (in general playlists)
-                    # YouTube Music playlists should only contain music videos
-                    video_id = item.get('contentDetails', {}).get('videoId')
-                    snippet = item.get('snippet', {})
-                    
-                    if not video_id or not snippet:
-                        continue
-                    
-                    # Get video details (to get duration)
-                    video_response = self.youtube.videos().list(
-                        part="contentDetails,snippet",
-                        id=video_id
-                    ).execute()
-                    
-                    if not video_response.get('items'):
-                        continue
-                    
-                    video_data = video_response['items'][0]
-                    video_snippet = video_data.get('snippet', {})
-                    
-                    # Try to extract artist and title from video title
-                    # Format is usually "Artist - Title" or "Artist - Title (Official Video)"
-                    video_title = video_snippet.get('title', '')
-                    artist, title = self._parse_video_title(video_title)
-                    
-                    # Convert duration from ISO format to milliseconds
-                    duration_iso = video_data.get('contentDetails', {}).get('duration', 'PT0S')
-                    duration_ms = self._iso_duration_to_ms(duration_iso)
-                    
-                    # Create Track object
-                    track = Track(
-                        name=title,
-                        artist=artist,
-                        duration_ms=duration_ms,
-                        uri={'youtube_music': f"youtube:video:{video_id}"},
-                        platform_ids={'youtube_music': video_id},
-                        album_art_url=video_snippet.get('thumbnails', {}).get('high', {}).get('url')
-                    )
-                    
-                    playlist.add_track(track)
+                # Collect the page's video IDs; items without one are skipped
+                # (YouTube Music playlists should only contain music videos)
+                page_items = [
+                    (item['contentDetails']['videoId'], item)
+                    for item in items_response.get('items', [])
+                    if item.get('snippet') and item.get('contentDetails', {}).get('videoId')
+                ]
+                
+                # Get video details (to get duration) for the whole page in one call
+                pending.append((page_items, executor.submit(self._fetch_videos, [video_id for video_id, _ in page_items])))
+                
+                # Hand over the pages whose videos have already arrived
+                while pending and pending[0][1].done():
+                    page_items, videos = pending.popleft()
+                    yield self._page_tracks(page_items, videos.result())
                 
                 # Check if there are more pages
                 next_page_token = items_response.get('nextPageToken')
                 if not next_page_token:
                     break
             
-            logger.info(f"Retrieved YouTube Music playlist '{playlist.name}' with {len(playlist.tracks)} tracks")
-            return playlist
+            while pending:
+                page_items, videos = pending.popleft()
+                yield self._page_tracks(page_items, videos.result())
+    
+    def _page_tracks(self, page_items: List[Tuple[str, Dict[str, Any]]],
+                     videos: Dict[str, Dict[str, Any]]) -> List[Track]:
+        """
+        Convert one page of playlist items to Track objects.
+        
+        Args:
+            page_items: (video ID, playlist item) pairs, in playlist order
+            videos: Video resources by ID
             
-        except Exception as e:
-            logger.error(f"Error getting YouTube Music playlist: {str(e)}")
-            return None
+        Returns:
+            Tracks for the items whose video was found
+        """
+        tracks = []
+        
+        for video_id, item in page_items:
+            video_data = videos.get(video_id)
+            
+            if not video_data:
+                continue
+            
+            video_snippet = video_data.get('snippet', {})
+            
+            # Try to extract artist and title from video title
+            # Format is usually "Artist - Title" or "Artist - Title (Official Video)"
+            video_title = video_snippet.get('title', '')
+            artist, title = self._parse_video_title(video_title)
+            
+            # Convert duration from ISO format to milliseconds
+            duration_iso = video_data.get('contentDetails', {}).get('duration', 'PT0S')
+            duration_ms = self._iso_duration_to_ms(duration_iso)
+            
+            # Create Track object
+            tracks.append(Track(
+                name=title,
+                artist=artist,
+                duration_ms=duration_ms,
+                uri={'youtube_music': f"youtube:video:{video_id}"},
+                platform_ids={'youtube_music': video_id},
+                album_art_url=video_snippet.get('thumbnails', {}).get('high', {}).get('url')
+            ))
+        
+        return tracks
     
     def search_track(self, track: Track) -> Optional[Track]:
         """
@@ -181,41 +308,51 @@ class YouTubeMusicService:
         Returns:
             Track object with YouTube Music details or None if not found
         """
+        return self.search_tracks([track])[0]
+    
+    def search_tracks(self, tracks: List[Track]) -> List[Optional[Track]]:
+        """
+        Search for many tracks on YouTube Music.
+        
+        The searches run concurrently, then the durations of all the videos
+        found are fetched together with one videos.list call per 50 IDs,
+        instead of one call per track.
+        
+        Args:
+            tracks: Track objects to search for
+            
+        Returns:
+            List of matching Track objects (None where not found), in input order
+        """
+        if not tracks:
+            return []
+        
         try:
             if not self.youtube:
                 self._initialize_client()
             
-            # Build search query
-            query = f"{track.name} {track.artist} music"
-            
             # Search for videos
-            search_response = self.youtube.search().list(
-                part="snippet",
-                q=query,
-                type="video",
-                maxResults=10,
-                videoEmbeddable="true",
-                videoCategoryId="10"  # Music category
-            ).execute()
+            with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(tracks))) as executor:
+                hits = list(executor.map(self._search_video, tracks))
             
-            if not search_response.get('items'):
-                return None
+            # Get video details (to get duration) for every video found
+            videos = self._fetch_videos([hit['id']['videoId'] for hit in hits if hit])
             
-            # Get the first result
-            video_data = search_response['items'][0]
-            video_id = video_data['id']['videoId']
-            snippet = video_data['snippet']
+        except Exception as e:
+            logger.error(f"Error searching YouTube Music tracks: {str(e)}")
+            return [None] * len(tracks)
+        
+        results: List[Optional[Track]] = []
+        
+        for track, hit in zip(tracks, hits):
+            video_details = videos.get(hit['id']['videoId']) if hit else None
             
-            # Get video details (to get duration)
-            video_response = self.youtube.videos().list(
-                part="contentDetails,snippet",
-                id=video_id
-            ).execute()
+            if not video_details:
+                results.append(None)
+                continue
             
-            if not video_response.get('items'):
-                return None
-            
-            video_details = video_response['items'][0]
+            video_id = hit['id']['videoId']
+            snippet = hit['snippet']
             
             # Try to extract artist and title from video title
             video_title = snippet.get('title', '')
@@ -232,19 +369,115 @@ class YouTubeMusicService:
             duration_ms = self._iso_duration_to_ms(duration_iso)
             
             # Create Track object
-            return Track(
+            results.append(Track(
                 name=title,
                 artist=artist,
                 duration_ms=duration_ms,
                 uri={'youtube_music': f"youtube:video:{video_id}"},
                 platform_ids={'youtube_music': video_id},
                 album_art_url=snippet.get('thumbnails', {}).get('high', {}).get('url')
-            )
+            ))
+        
+        return results
+    
+    def _search_video(self, track: Track) -> Optional[Dict[str, Any]]:
+        """
+        Find the best matching video for a track.
+        
+        Args:
+            track: Track object to search for
+            
+        Returns:
+            The first search result, or None if nothing was found
+        """
+        try:
+            # Build search query
+            query = f"{track.name} {track.artist} music"
+            
+            search_response = self._execute(self.youtube.search().list(
+                part="snippet",
+                q=query,
+                type="video",
+                maxResults=10,
+                videoEmbeddable="true",
+                videoCategoryId="10",  # Music category
+                fields="items(id/videoId,snippet(title,thumbnails/high/url))"
+            ))
+            
+            # Get the first result
+            items = search_response.get('items')
+            return items[0] if items else None
             
         except Exception as e:
             logger.error(f"Error searching YouTube Music track: {str(e)}")
             return None
     
+    def _fetch_videos(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get video details for many videos with one API call per 50 IDs.
+        
+        Videos looked up in the last day are served from a process-wide
+        cache, backed by a disk cache that survives restarts; only the
+        remaining IDs are requested.
+        
+        Args:
+            video_ids: YouTube video IDs
+            
+        Returns:
+            Dictionary mapping each video ID that was found to its video resource
+        """
+        videos: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        
+        with self._video_cache_lock:
+            for video_id in video_ids:
+                video_data = self._video_cache.get(video_id)
+                if video_data is None:
+                    missing.append(video_id)
+                else:
+                    videos[video_id] = video_data
+        
+        # Fall back to the disk cache for anything fetched in the last day
+        if missing:
+            now = time.time()
+            stored = _video_disk_cache.get_many([f"youtube:video:{video_id}" for video_id in missing])
+            found = {}
+            for video_id in missing:
+                entry = stored.get(f"youtube:video:{video_id}")
+                if entry and entry[0] == VIDEO_DISK_CACHE_VERSION:
+                    fetched_at, video_data = entry[1]
+                    if now - fetched_at < VIDEO_CACHE_TTL:
+                        found[video_id] = video_data
+            
+            if found:
+                videos.update(found)
+                missing = [video_id for video_id in missing if video_id not in found]
+                with self._video_cache_lock:
+                    self._video_cache.update(found)
+        
+        for i in range(0, len(missing), VIDEO_BATCH_SIZE):
+            batch = missing[i:i+VIDEO_BATCH_SIZE]
+            video_response = self._execute(self.youtube.videos().list(
+                part="contentDetails,snippet",
+                id=",".join(batch),
+                maxResults=VIDEO_BATCH_SIZE,
+                fields="items(id,contentDetails/duration,snippet(title,thumbnails/high/url))"
+            ))
+            
+            fetched = {video_data['id']: video_data for video_data in video_response.get('items', [])}
+            videos.update(fetched)
+            
+            with self._video_cache_lock:
+                self._video_cache.update(fetched)
+            
+            fetched_at = time.time()
+            _video_disk_cache.set_many(
+                {f"youtube:video:{video_id}": (fetched_at, video_data) for video_id, video_data in fetched.items()},
+                version=VIDEO_DISK_CACHE_VERSION
+            )
+        
+        return videos
+    
     def create_playlist(self, name: str, description: str, tracks: List[Track]) -> Optional[Playlist]:
         """
         Create a new playlist on YouTube Music.
@@ -262,7 +495,7 @@ class YouTubeMusicService:
                 raise ValueError("OAuth credentials required to create YouTube playlists")
             
             # Create playlist
-            playlist_response = self.youtube.playlists().insert(
+            playlist_response = self._execute(self.youtube.playlists().insert(
                 part="snippet,status",
                 body={
                     "snippet": {
@@ -273,7 +506,7 @@ class YouTubeMusicService:
                         "privacyStatus": "public"
                     }
                 }
-            ).execute()
+            ))
             
             if not playlist_response or 'id' not in playlist_response:
                 logger.error("Failed to create YouTube Music playlist")
@@ -293,19 +526,21 @@ class YouTubeMusicService:
                 is_public=True
             )
             
-            # Add tracks to playlist
-            for track in tracks:
-                video_id = track.platform_ids.get('youtube_music')
-                
-                if not video_id:
-                    # Try to search for the track if we don't have an ID
-                    found_track = self.search_track(track)
+            # Look up the tracks we don't have an ID for in one batch; the
+            # searches are independent, unlike the inserts below
+            video_ids = [track.get_platform_id('youtube_music') for track in tracks]
+            pending = [i for i, video_id in enumerate(video_ids) if not video_id]
+            
+            if pending:
+                for i, found_track in zip(pending, self.search_tracks([tracks[i] for i in pending])):
                     if found_track:
-                        video_id = found_track.platform_ids.get('youtube_music')
-                
+                        video_ids[i] = found_track.get_platform_id('youtube_music')
+            
+            # Add tracks to playlist one at a time, so they keep their order
+            for track, video_id in zip(tracks, video_ids):
                 if video_id:
                     try:
-                        self.youtube.playlistItems().insert(
+                        self._execute(self.youtube.playlistItems().insert(
                             part="snippet",
                             body={
                                 "snippet": {
@@ -316,7 +551,7 @@ class YouTubeMusicService:
                                     }
                                 }
                             }
-                        ).execute()
+                        ))
                         
                         # Add track to playlist object
                         playlist.add_track(track)
@@ -331,7 +566,8 @@ class YouTubeMusicService:
             logger.error(f"Error creating YouTube Music playlist: {str(e)}")
             return None
     
-    def _parse_video_title(self, title: str) -> Tuple[str, str]:
+    @staticmethod
+    def _parse_video_title(title: str) -> Tuple[str, str]:
         """
         Parse artist and track name from YouTube video title.
         
@@ -348,7 +584,7 @@ class YouTubeMusicService:
         # "Artist - Track | Official Video"
         
         # Try the most common pattern first
-        match = re.match(r'^(.*?)\s*[-:]\s*(.*?)(?:\s*[\(\[\|].*)?$', title)
+        match = _TITLE_RE.match(title)
         
         if match:
             artist = match.group(1).strip()
@@ -358,7 +594,8 @@ class YouTubeMusicService:
         # If no match, return the full title as the track name and empty artist
         return "", title
     
-    def _iso_duration_to_ms(self, iso_duration: str) -> int:
+    @staticmethod
+    def _iso_duration_to_ms(iso_duration: str) -> int:
         """
         Convert ISO 8601 duration to milliseconds.
         
@@ -368,26 +605,15 @@ class YouTubeMusicService:
         Returns:
             Duration in milliseconds
         """
-        hours = 0
-        minutes = 0
-        seconds = 0
+        # Scan once, accumulating each number until its unit letter
+        total = 0
+        number = 0
         
-        # Extract hours
-        hour_match = re.search(r'(\d+)H', iso_duration)
-        if hour_match:
-            hours = int(hour_match.group(1))
-        
-        # Extract minutes
-        minute_match = re.search(r'(\d+)M', iso_duration)
-        if minute_match:
-            minutes = int(minute_match.group(1))
-        
-        # Extract seconds
-        second_match = re.search(r'(\d+)S', iso_duration)
-        if second_match:
-            seconds = int(second_match.group(1))
-        
-        # Calculate total milliseconds
-        total_ms = (hours * 3600 + minutes * 60 + seconds) * 1000
+        for char in iso_duration:
+            if '0' <= char <= '9':
+                number = number * 10 + (ord(char) - 48)
+            else:
+                total += number * _ISO_UNIT_MS.get(char, 0)
+                number = 0
         
-        return total_ms
\ No newline at end of file
+        return total
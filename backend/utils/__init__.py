@@ -5,7 +5,7 @@ This package contains utility functions used throughout the BeatBridge applicati
 """
 
 from .auth import generate_apple_music_token, refresh_spotify_token, refresh_youtube_token
-from .matching import match_tracks, match_track_by_isrc, calculate_track_similarity
+from .matching import match_tracks, match_tracks_stream, match_track_by_isrc, calculate_track_similarity
 from .logging import setup_logging, log_error, log_request
 
 __all__ = [
@@ -13,6 +13,7 @@ __all__ = [
     'refresh_spotify_token',
     'refresh_youtube_token',
     'match_tracks',
+    'match_tracks_stream',
     'match_track_by_isrc',
     'calculate_track_similarity',
     'setup_logging',
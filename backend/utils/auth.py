@@ -6,52 +6,116 @@ This module provides authentication-related utility functions for BeatBridge.
 
 import os
 import time
-import json
+import base64
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import jwt
+import orjson
+import requests
+from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurvePrivateKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session, so token refreshes and checks reuse kept-alive connections
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False
+    )
+))
+
+# Apple Music developer tokens live 12 hours; a new one is signed 5 minutes before expiry
+APPLE_TOKEN_TTL = 12 * 3600
+APPLE_TOKEN_REFRESH_MARGIN = 300
+
+# Last developer token issued and the parsed private key it was signed with
+_apple_token_lock = threading.Lock()
+_apple_token_cache: Dict[str, Any] = {'token': None, 'exp': 0.0, 'identity': None}
+_apple_key_cache: Dict[str, Any] = {'path': None, 'mtime': None, 'key': None}
+
+
+def _load_apple_private_key(private_key_path: str) -> EllipticCurvePrivateKey:
+    """
+    Load the Apple Music private key, reusing the parsed key while the file is unchanged.
+    
+    Must be called with `_apple_token_lock` held.
+    
+    Args:
+        private_key_path: Path to the .p8 private key file
+        
+    Returns:
+        EllipticCurvePrivateKey: The parsed private key, ready for ES256 signing
+    """
+    mtime = os.path.getmtime(private_key_path)
+    
+    if _apple_key_cache['path'] != private_key_path or _apple_key_cache['mtime'] != mtime:
+        with open(private_key_path, 'rb') as file:
+            key = load_pem_private_key(file.read(), password=None)
+        _apple_key_cache.update(path=private_key_path, mtime=mtime, key=key)
+    
+    return _apple_key_cache['key']
+
 
 def generate_apple_music_token() -> str:
     """
     Generate an Apple Music developer token for API access.
     
+    Tokens are valid for 12 hours, so the last one is reused until shortly
+    before it expires instead of being re-signed on every call.
+    
     Returns:
         str: JWT token for Apple Music API
     """
-    try:
-        team_id = os.getenv('APPLE_MUSIC_TEAM_ID')
-        key_id = os.getenv('APPLE_MUSIC_KEY_ID')
-        private_key_path = os.getenv('APPLE_MUSIC_PRIVATE_KEY_PATH')
-        
-        # Read private key
-        with open(private_key_path, 'r') as file:
-            private_key = file.read()
-        
-        # Set issue time and expiration time
-        issue_time = datetime.utcnow()
-        expiry_time = issue_time + timedelta(hours=12)
-        
-        # Create the token
-        token = jwt.encode({
-            'iss': team_id,  # Issuer: Team ID
-            'iat': issue_time,  # Issued at
-            'exp': expiry_time,  # Expiration time
-        }, private_key, algorithm='ES256', headers={
-            'kid': key_id,  # Key ID
-            'alg': 'ES256'  # Algorithm
-        })
-        
-        logger.info("Generated Apple Music developer token")
-        return token
-        
-    except Exception as e:
-        logger.error(f"Error generating Apple Music token: {str(e)}")
-        raise
+    with _apple_token_lock:
+        try:
+            team_id = os.getenv('APPLE_MUSIC_TEAM_ID')
+            key_id = os.getenv('APPLE_MUSIC_KEY_ID')
+            private_key_path = os.getenv('APPLE_MUSIC_PRIVATE_KEY_PATH')
+            
+            # Reuse the cached token if it was issued for the same credentials
+            # and is not about to expire
+            identity = (team_id, key_id, private_key_path)
+            now = time.time()
+            if (_apple_token_cache['token'] and _apple_token_cache['identity'] == identity and
+                    now < _apple_token_cache['exp'] - APPLE_TOKEN_REFRESH_MARGIN):
+                return _apple_token_cache['token']
+            
+            # Load private key (parsed once, not on every signing)
+            private_key = _load_apple_private_key(private_key_path)
+            
+            # Set issue time and expiration time
+            issue_time = datetime.utcfromtimestamp(now)
+            expiry_time = issue_time + timedelta(seconds=APPLE_TOKEN_TTL)
+            
+            # Create the token
+            token = jwt.encode({
+                'iss': team_id,  # Issuer: Team ID
+                'iat': issue_time,  # Issued at
+                'exp': expiry_time,  # Expiration time
+            }, private_key, algorithm='ES256', headers={
+                'kid': key_id,  # Key ID
+                'alg': 'ES256'  # Algorithm
+            })
+            
+            _apple_token_cache.update(token=token, exp=now + APPLE_TOKEN_TTL, identity=identity)
+            
+            logger.info("Generated Apple Music developer token")
+            return token
+            
+        except Exception as e:
+            logger.error(f"Error generating Apple Music token: {str(e)}")
+            raise
 
 
 def refresh_spotify_token(refresh_token: str) -> Optional[str]:
@@ -64,9 +128,6 @@ def refresh_spotify_token(refresh_token: str) -> Optional[str]:
     Returns:
         str: New access token or None if refresh failed
     """
-    import base64
-    import requests
-    
     try:
         client_id = os.getenv('SPOTIFY_CLIENT_ID')
         client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
@@ -76,7 +137,7 @@ def refresh_spotify_token(refresh_token: str) -> Optional[str]:
         client_creds_b64 = base64.b64encode(client_creds.encode()).decode()
         
         # Make token request
-        response = requests.post(
+        response = _session.post(
             'https://accounts.spotify.com/api/token',
             data={
                 'grant_type': 'refresh_token',
@@ -88,7 +149,7 @@ def refresh_spotify_token(refresh_token: str) -> Optional[str]:
         )
         
         response.raise_for_status()
-        token_data = response.json()
+        token_data = orjson.loads(response.content)
         
         logger.info("Successfully refreshed Spotify access token")
         return token_data.get('access_token')
@@ -108,14 +169,12 @@ def refresh_youtube_token(refresh_token: str) -> Optional[str]:
     Returns:
         str: New access token or None if refresh failed
     """
-    import requests
-    
     try:
         client_id = os.getenv('YOUTUBE_CLIENT_ID')
         client_secret = os.getenv('YOUTUBE_CLIENT_SECRET')
         
         # Make token request
-        response = requests.post(
+        response = _session.post(
             'https://oauth2.googleapis.com/token',
             data={
                 'client_id': client_id,
@@ -126,7 +185,7 @@ def refresh_youtube_token(refresh_token: str) -> Optional[str]:
         )
         
         response.raise_for_status()
-        token_data = response.json()
+        token_data = orjson.loads(response.content)
         
         logger.info("Successfully refreshed YouTube access token")
         return token_data.get('access_token')
@@ -146,10 +205,8 @@ def verify_spotify_token(token: str) -> bool:
     Returns:
         bool: True if token is valid, False otherwise
     """
-    import requests
-    
     try:
-        response = requests.get(
+        response = _session.get(
             'https://api.spotify.com/v1/me',
             headers={
                 'Authorization': f'Bearer {token}'
@@ -172,14 +229,12 @@ def verify_apple_music_token(token: str) -> bool:
     Returns:
         bool: True if token is valid, False otherwise
     """
-    import requests
-    
     try:
         # Generate developer token
         developer_token = generate_apple_music_token()
         
         # Make a test request to the API
-        response = requests.get(
+        response = _session.get(
             'https://api.music.apple.com/v1/me/library/playlists',
             headers={
                 'Authorization': f'Bearer {developer_token}',
@@ -7,8 +7,15 @@ This module defines configuration settings for the BeatBridge backend service.
 import os
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from .env; production gets them from the real
+# environment, so skip the file read there
+if os.getenv('FLASK_ENV') != 'production':
+    load_dotenv()
+
+
+def _split_origins(value: str) -> list:
+    """Split a comma-separated CORS_ORIGINS value, dropping blank entries."""
+    return [origin.strip() for origin in value.split(',') if origin.strip()]
 
 
 class Config:
@@ -21,7 +28,7 @@ class Config:
     
     # API settings
     API_PREFIX = '/api'
-    CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
+    CORS_ORIGINS = _split_origins(os.getenv('CORS_ORIGINS', '*'))
     
     # Redis settings
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
@@ -69,7 +76,7 @@ class ProductionConfig(Config):
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
     # Security settings
-    CORS_ORIGINS = os.getenv('CORS_ORIGINS', '').split(',')
+    CORS_ORIGINS = _split_origins(os.getenv('CORS_ORIGINS', ''))
 
 
 # Configuration dictionary
@@ -81,7 +88,10 @@ config = {
 }
 
 
+# Configuration for the current environment, resolved once at import
+_active_config = config.get(os.getenv('FLASK_ENV', 'default'), config['default'])
+
+
 def get_config():
     """Get current configuration based on environment."""
-    environment = os.getenv('FLASK_ENV', 'default')
-    return config.get(environment, config['default'])
\ No newline at end of file
+    return _active_config
\ No newline at end of file
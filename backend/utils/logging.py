@@ -5,16 +5,30 @@ This module provides utilities for logging in the BeatBridge application.
 """
 
 import os
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
+# Request parameter names whose values are masked in request logs (lower-case)
+_SENSITIVE_PARAMS = frozenset({
+    'token', 'key', 'secret', 'password', 'auth', 'authorization',
+    'api_key', 'access_token', 'refresh_token', 'client_secret'
+})
+
+# Background thread writing queued log records to the real handlers
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> None:
     """
     Set up logging for the application.
     
+    Records are handed to a queue and written to the console and log file by
+    a background thread, so logging never blocks the calling thread on I/O.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (if None, logs to console only)
@@ -32,7 +46,11 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> No
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
-    # Remove any existing handlers
+    # Remove any existing handlers, stopping the writer from a previous setup
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
@@ -45,7 +63,7 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> No
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # Create file handler if log file is specified
     if log_file:
@@ -56,7 +74,13 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> No
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Queue records from the calling thread; the listener formats and writes them
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     # Suppress noisy loggers
     logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -64,7 +88,16 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> No
     logging.getLogger('chardet').setLevel(logging.WARNING)
     logging.getLogger('googleapiclient').setLevel(logging.WARNING)
     
-    logging.info(f"Logging configured with level {log_level}")
+    logging.info("Logging configured with level %s", log_level)
+
+
+def _stop_listener() -> None:
+    """Flush queued log records at interpreter exit."""
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
 
 
 def log_error(logger, message: str, exc_info: Optional[Exception] = None) -> None:
@@ -76,8 +109,12 @@ def log_error(logger, message: str, exc_info: Optional[Exception] = None) -> Non
         message: Error message
         exc_info: Exception information (if available)
     """
+    # Skip building the message when errors aren't being logged
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    
     if exc_info:
-        logger.error(f"{message}: {str(exc_info)}", exc_info=exc_info)
+        logger.error("%s: %s", message, exc_info, exc_info=exc_info)
     else:
         logger.error(message)
 
@@ -93,20 +130,28 @@ def log_request(logger, method: str, url: str, params: Optional[dict] = None, st
         params: Request parameters (optional)
         status_code: Response status code (optional)
     """
-    message = f"{method} {url}"
+    # Requests are logged at DEBUG; skip masking and formatting otherwise
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
+    message = "%s %s"
+    args = [method, url]
     
     if params:
         # Mask sensitive parameters
         masked_params = {}
         for key, value in params.items():
-            if key.lower() in ('token', 'key', 'secret', 'password', 'auth'):
+            if key.lower() in _SENSITIVE_PARAMS:
                 masked_params[key] = '********'
             else:
                 masked_params[key] = value
         
-        message += f" params={masked_params}"
+        message += " params=%s"
+        args.append(masked_params)
     
     if status_code:
-        message += f" status={status_code}"
+        message += " status=%s"
+        args.append(status_code)
     
-    logger.debug(message)
\ No newline at end of file
+    # Formatting is deferred until a handler emits the record
+    logger.debug(message, *args)
\ No newline at end of file
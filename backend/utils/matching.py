@@ -5,21 +5,132 @@ This module provides utilities for matching tracks between different music platf
 """
 
 import logging
-import time
-from typing import Dict, List, Tuple, Optional, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Optional, Any
+
+from rapidfuzz import fuzz, process
 
 from models.track import Track
 from services.spotify import SpotifyService
 from services.apple_music import AppleMusicService
 from services.youtube_music import YouTubeMusicService
+from .search_cache import search_cache
 
 logger = logging.getLogger(__name__)
 
+# Minimum score for find_best_match: WRatio (0-100) plus up to
+# DURATION_BONUS points for a matching duration
+MATCH_SCORE_CUTOFF = 80
+DURATION_BONUS = 10
+
+# Tracks looked up per batch by match_tracks_stream, and how many batches
+# are looked up at once
+MATCH_BATCH_SIZE = 50
+MATCH_WINDOW = 4
+
+
+def _lookup_batch(batch: List[Track], destination_service: Any) -> List[Optional[Track]]:
+    """
+    Find the destination match for each track of a batch.
+    
+    Tracks matched by an earlier conversion are served from the shared search
+    cache; the rest are handed to the destination service's `search_tracks`
+    at once, and the matches found are cached.
+    
+    Args:
+        batch: Track objects to look up
+        destination_service: Service for the destination platform
+        
+    Returns:
+        List of matching Track objects (None where not found), in batch order
+    """
+    # Reuse earlier matches; only search for the rest
+    keys = [search_cache.key(destination_service.platform, track) for track in batch]
+    cached = search_cache.get_many(keys)
+    matches = [cached.get(key) for key in keys]
+    pending = [i for i, match in enumerate(matches) if match is None]
+    
+    # Try to find matches on destination platform
+    if pending:
+        found = destination_service.search_tracks([batch[i] for i in pending])
+        for i, match in zip(pending, found):
+            matches[i] = match
+        search_cache.set_many({keys[i]: matches[i] for i in pending if matches[i]})
+    
+    if cached:
+        logger.debug(f"Reused {len(cached)} cached matches")
+    
+    return matches
+
+
+def match_tracks_stream(tracks: List[Track], destination_service: Any) -> Iterator[Tuple[Track, bool]]:
+    """
+    Match tracks from one platform to another, yielding results as they arrive.
+    
+    Tracks are matched in batches of MATCH_BATCH_SIZE, in input order, so
+    callers can report progress or act on the first matches while later
+    batches are still being searched. Up to MATCH_WINDOW batches are looked
+    up at once on a single executor, so a slow lookup in one batch does not
+    hold back the searches of the next ones.
+    
+    Args:
+        tracks: List of Track objects to match
+        destination_service: Service for the destination platform
+        
+    Yields:
+        Tuple of (track, matched) for each input track, in input order
+    """
+    batches = (tracks[start:start + MATCH_BATCH_SIZE] for start in range(0, len(tracks), MATCH_BATCH_SIZE))
+    in_flight = deque()
+    
+    with ThreadPoolExecutor(max_workers=MATCH_WINDOW) as executor:
+        try:
+            for batch in batches:
+                in_flight.append((batch, executor.submit(_lookup_batch, batch, destination_service)))
+                if len(in_flight) < MATCH_WINDOW:
+                    continue
+                
+                yield from _merge_batch(*in_flight.popleft())
+            
+            while in_flight:
+                yield from _merge_batch(*in_flight.popleft())
+        
+        finally:
+            # Don't start the remaining lookups if the caller stopped early
+            for _, future in in_flight:
+                future.cancel()
+
+
+def _merge_batch(batch: List[Track], future: Any) -> Iterator[Tuple[Track, bool]]:
+    """
+    Wait for a batch's lookup and merge the matches into its tracks.
+    
+    Args:
+        batch: Track objects of the batch
+        future: Future of the batch's `_lookup_batch` call
+        
+    Yields:
+        Tuple of (track, matched) for each track of the batch, in order
+    """
+    for track, match in zip(batch, future.result()):
+        if match:
+            # Update original track with destination platform details
+            track.merge_platform_data(match)
+            
+            logger.debug(f"Found match for '{track.name}' by {track.artist}")
+        else:
+            logger.debug(f"No match found for '{track.name}' by {track.artist}")
+        
+        yield track, match is not None
+
 
 def match_tracks(tracks: List[Track], destination_service: Any) -> Tuple[List[Track], List[Track]]:
     """
     Match tracks from one platform to another.
     
+    Collects the results of `match_tracks_stream`.
+    
     Args:
         tracks: List of Track objects to match
         destination_service: Service for the destination platform
@@ -32,29 +143,11 @@ def match_tracks(tracks: List[Track], destination_service: Any) -> Tuple[List[Tr
     
     logger.info(f"Matching {len(tracks)} tracks to destination platform")
     
-    for index, track in enumerate(tracks):
-        logger.debug(f"Matching track {index+1}/{len(tracks)}: {track.name} by {track.artist}")
-        
-        # Try to find match on destination platform
-        match = destination_service.search_track(track)
-        
-        if match:
-            # Update original track with destination platform details
-            track.uri.update(match.uri)
-            track.platform_ids.update(match.platform_ids)
-            
-            # Add to matched tracks
+    for track, matched in match_tracks_stream(tracks, destination_service):
+        if matched:
             matched_tracks.append(track)
-            
-            logger.debug(f"Found match for '{track.name}' by {track.artist}")
         else:
-            # Add to failed tracks
             failed_tracks.append(track)
-            
-            logger.debug(f"No match found for '{track.name}' by {track.artist}")
-        
-        # Add a small delay to avoid rate limiting
-        time.sleep(0.1)
     
     logger.info(f"Matched {len(matched_tracks)}/{len(tracks)} tracks")
     return matched_tracks, failed_tracks
@@ -92,27 +185,30 @@ def calculate_track_similarity(track1: Track, track2: Track) -> float:
     score = 0.0
     total_weight = 0.0
     
-    # Compare track names (highest weight)
+    # Compare track names (highest weight) using the precomputed normalized forms
     name_weight = 0.5
-    if track1.name.lower() == track2.name.lower():
+    name1, name2 = track1._norm_name, track2._norm_name
+    if name1 == name2:
         score += name_weight
-    elif track1.name.lower() in track2.name.lower() or track2.name.lower() in track1.name.lower():
+    elif name1 in name2 or name2 in name1:
         score += name_weight * 0.8
     total_weight += name_weight
     
     # Compare artist names
     artist_weight = 0.3
-    if track1.artist.lower() == track2.artist.lower():
+    artist1, artist2 = track1._norm_artist, track2._norm_artist
+    if artist1 == artist2:
         score += artist_weight
-    elif track1.artist.lower() in track2.artist.lower() or track2.artist.lower() in track1.artist.lower():
+    elif artist1 in artist2 or artist2 in artist1:
         score += artist_weight * 0.8
     total_weight += artist_weight
     
     # Compare album names
     album_weight = 0.1
-    if track1.album and track2.album and (track1.album.lower() == track2.album.lower()):
+    album1, album2 = track1._album_lc, track2._album_lc
+    if album1 and album2 and album1 == album2:
         score += album_weight
-    elif track1.album and track2.album and (track1.album.lower() in track2.album.lower() or track2.album.lower() in track1.album.lower()):
+    elif album1 and album2 and (album1 in album2 or album2 in album1):
         score += album_weight * 0.8
     total_weight += album_weight
     
@@ -136,10 +232,23 @@ def calculate_track_similarity(track1: Track, track2: Track) -> float:
     return score / total_weight if total_weight > 0 else 0.0
 
 
+def _match_text(track: Track) -> str:
+    """Build the string a track is fuzzy-matched on from its normalized fields."""
+    return f"{track._norm_name} {track._norm_artist} {track._album_lc}"
+
+
 def find_best_match(track: Track, candidates: List[Track]) -> Optional[Track]:
     """
     Find the best matching track from a list of candidates.
     
+    All candidates are scored against the track in one RapidFuzz call
+    (WRatio over name, artist and album), and candidates whose duration is
+    close to the track's get a bonus of up to DURATION_BONUS points.
+    Candidates that can't reach MATCH_SCORE_CUTOFF even with the full bonus
+    are dropped inside RapidFuzz, before any per-candidate Python work.
+    Duplicate candidates (same ISRC, or same name and artist when there is
+    no ISRC) are scored once, keeping the first one returned.
+    
     Args:
         track: Track to match
         candidates: List of candidate Track objects
@@ -147,19 +256,46 @@ def find_best_match(track: Track, candidates: List[Track]) -> Optional[Track]:
     Returns:
         Best matching Track or None if no good match
     """
-    best_match = None
-    best_score = 0.0
+    if not candidates:
+        return None
     
+    # Search results often repeat a recording in several editions; score each once
+    unique: Dict[str, Track] = {}
     for candidate in candidates:
-        score = calculate_track_similarity(track, candidate)
+        unique.setdefault(candidate.isrc or candidate._dedup_key, candidate)
+    candidates = list(unique.values())
+    
+    # Pull the fields scored on out of the candidates once, as parallel lists
+    texts = [_match_text(candidate) for candidate in candidates]
+    durations = [candidate.duration_ms for candidate in candidates]
+    
+    scores = process.extract(
+        _match_text(track),
+        texts,
+        scorer=fuzz.WRatio,
+        processor=None,
+        limit=None,
+        score_cutoff=MATCH_SCORE_CUTOFF - DURATION_BONUS
+    )
+    
+    best_index = None
+    best_score = 0.0
+    duration = track.duration_ms
+    
+    for _, score, index in scores:
+        # Reward candidates whose duration is close to the track's
+        candidate_duration = durations[index]
+        if duration > 0 and candidate_duration > 0:
+            longest = max(duration, candidate_duration)
+            score += DURATION_BONUS * (1 - abs(duration - candidate_duration) / longest)
         
         if score > best_score:
             best_score = score
-            best_match = candidate
+            best_index = index
     
     # Only return a match if it's good enough
-    if best_score >= 0.8:
-        return best_match
+    if best_index is not None and best_score >= MATCH_SCORE_CUTOFF:
+        return candidates[best_index]
     
     return None
 
@@ -168,21 +304,18 @@ def deduplicate_tracks(tracks: List[Track]) -> List[Track]:
     """
     Remove duplicate tracks from a list.
     
+    Tracks are duplicates when their name and artist match case-insensitively;
+    the first occurrence is kept, in the original order.
+    
     Args:
         tracks: List of Track objects
         
     Returns:
         List of unique Track objects
     """
-    unique_tracks = []
-    seen_ids = set()
-    
+    # setdefault keeps the first track for each key; dicts preserve insertion order
+    unique_tracks: Dict[str, Track] = {}
     for track in tracks:
-        # Create a unique ID based on name and artist
-        unique_id = f"{track.name.lower()}|{track.artist.lower()}"
-        
-        if unique_id not in seen_ids:
-            seen_ids.add(unique_id)
-            unique_tracks.append(track)
+        unique_tracks.setdefault(track._dedup_key, track)
     
-    return unique_tracks
\ No newline at end of file
+    return list(unique_tracks.values())
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Search Cache
+
+This module implements the cache of destination-platform matches shared by
+every conversion, so songs that appear in many playlists are searched once.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from cachetools import TTLCache
+
+from models.track import Track
+from services.cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# How many matches to keep in memory, and for how long (seconds)
+MATCH_CACHE_SIZE = 50_000
+MATCH_CACHE_TTL = 7 * 86400
+
+# ISRC matches identify the same recording, so they stay valid on disk for longer
+ISRC_MATCH_TTL = 30 * 86400
+
+# Bump when the cached Track shape or the key format changes so older disk
+# entries are ignored
+MATCH_CACHE_VERSION = '2'
+
+
+class SearchCache:
+    """
+    Two-level cache of search matches: an in-memory TTL cache in front of a
+    disk cache that survives worker restarts.
+
+    Only matches are stored; a track that wasn't found is searched again next
+    time, since it may have been added to the platform since. Expired entries
+    are purged from disk on the first write in a process and then
+    periodically, so long-running workers don't grow the file unbounded.
+    """
+
+    def __init__(self, maxsize: int = MATCH_CACHE_SIZE, ttl: int = MATCH_CACHE_TTL,
+                 isrc_ttl: int = ISRC_MATCH_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of matches kept in memory
+            ttl: How long a match stays valid, in seconds
+            isrc_ttl: How long a match found by ISRC stays valid on disk, in seconds
+        """
+        self.ttl = ttl
+        self.isrc_ttl = isrc_ttl
+        self._memory: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._disk = DiskCache('matches', max_age=max(ttl, isrc_ttl))
+
+    @staticmethod
+    def key(platform: str, track: Track) -> str:
+        """
+        Build the cache key for searching a track on a platform.
+
+        Tracks are keyed by ISRC when they have one, otherwise by their
+        lowercased name and artist. The name is not normalized, so live
+        versions, remixes and featured-artist credits keep separate entries.
+
+        Args:
+            platform: Destination platform name
+            track: Track being searched for
+
+        Returns:
+            str: Cache key
+        """
+        if track.isrc:
+            return f"{platform}:isrc:{track.isrc.upper()}"
+        return f"{platform}:name:{track._dedup_key}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, Track]:
+        """
+        Get the cached matches for several keys.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary mapping each cached key to its match
+        """
+        found: Dict[str, Track] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                match = self._memory.get(key)
+                if match is None:
+                    missing.append(key)
+                else:
+                    found[key] = match
+
+        if missing:
+            now = time.time()
+            from_disk = {}
+            for key, (version, value) in self._disk.get_many(missing).items():
+                if version == MATCH_CACHE_VERSION:
+                    stored_at, match = value
+                    ttl = self.isrc_ttl if ':isrc:' in key else self.ttl
+                    if now - stored_at < ttl:
+                        from_disk[key] = match
+
+            if from_disk:
+                found.update(from_disk)
+                with self._lock:
+                    self._memory.update(from_disk)
+
+        return found
+
+    def set_many(self, matches: Dict[str, Track]) -> None:
+        """
+        Store several matches.
+
+        Args:
+            matches: Dictionary mapping cache keys to matches
+        """
+        if not matches:
+            return
+
+        with self._lock:
+            self._memory.update(matches)
+
+        stored_at = time.time()
+        self._disk.set_many(
+            {key: (stored_at, match) for key, match in matches.items()},
+            version=MATCH_CACHE_VERSION
+        )
+
+
+# Shared by every conversion in the process
+search_cache = SearchCache()
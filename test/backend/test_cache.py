@@ -0,0 +1,66 @@
+"""
+Tests for the persistent disk cache.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from services import cache
+from services.cache import DiskCache
+
+
+class DiskCachePurgeTestCase(unittest.TestCase):
+    """Test case for DiskCache expiry."""
+    
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DiskCache('test', directory=self.tmp.name, max_age=60)
+    
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+    
+    def test_first_write_purges_expired_entries(self):
+        """The first write in a process drops entries older than max_age."""
+        with patch.object(cache.time, 'time', return_value=time.time() - 120):
+            self.cache.set('old', 1)
+        self.cache._next_purge = 0.0
+        
+        self.cache.set('new', 2)
+        
+        self.assertIsNone(self.cache.get('old'))
+        self.assertEqual(self.cache.get('new'), (None, 2))
+    
+    def test_purges_again_after_the_interval(self):
+        """Writes between purges don't purge; the next one after PURGE_INTERVAL does."""
+        self.cache.set('first', 1)
+        with patch.object(cache.time, 'time', return_value=time.time() - 120):
+            self.cache.set('old', 1)
+        
+        self.cache.set('other', 2)
+        self.assertIsNotNone(self.cache.get('old'))
+        
+        self.cache._next_purge = time.monotonic()
+        self.cache.set('other', 3)
+        self.assertIsNone(self.cache.get('old'))
+    
+    def test_without_max_age_entries_are_kept(self):
+        """A cache without max_age never purges on write."""
+        keep = DiskCache('keep', directory=self.tmp.name)
+        with patch.object(cache.time, 'time', return_value=0.0):
+            keep.set('old', 1)
+        keep.set('new', 2)
+        
+        self.assertEqual(keep.get('old'), (None, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
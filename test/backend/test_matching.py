@@ -0,0 +1,140 @@
+"""
+Tests for the track matching utilities.
+"""
+
+import unittest
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from models.track import Track
+from utils import matching
+
+
+class FakeService:
+    """Destination service whose searches match every track by name."""
+    
+    platform = 'fake'
+    
+    def __init__(self):
+        self.searched = []
+        self.lock = threading.Lock()
+    
+    def search_tracks(self, tracks):
+        with self.lock:
+            self.searched.append([track.name for track in tracks])
+        return [Track(name=track.name, artist=track.artist, platform_ids={'fake': track.name}) for track in tracks]
+
+
+class MatchTracksStreamTestCase(unittest.TestCase):
+    """Test case for match_tracks_stream."""
+    
+    def setUp(self):
+        """Bypass the shared search cache."""
+        cache = MagicMock()
+        cache.get_many.return_value = {}
+        patcher = patch.object(matching, 'search_cache', cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_results_keep_input_order(self):
+        """Results of every batch come back in input order."""
+        tracks = [Track(name=f"Song {i}", artist="Artist") for i in range(7)]
+        
+        with patch.object(matching, 'MATCH_BATCH_SIZE', 2):
+            results = list(matching.match_tracks_stream(tracks, FakeService()))
+        
+        self.assertEqual([track.name for track, _ in results], [track.name for track in tracks])
+        self.assertTrue(all(matched for _, matched in results))
+        self.assertEqual(tracks[6].get_platform_id('fake'), "Song 6")
+    
+    def test_slow_batch_does_not_hold_back_later_batches(self):
+        """Later batches are searched while an earlier one is still running."""
+        service = FakeService()
+        release = threading.Event()
+        second_searched = threading.Event()
+        search = service.search_tracks
+        
+        def search_tracks(tracks):
+            if tracks[0].name == "Song 0":
+                release.wait(5)
+            else:
+                second_searched.set()
+            return search(tracks)
+        
+        service.search_tracks = search_tracks
+        tracks = [Track(name=f"Song {i}", artist="Artist") for i in range(4)]
+        results = []
+        
+        with patch.object(matching, 'MATCH_BATCH_SIZE', 2):
+            stream = matching.match_tracks_stream(tracks, service)
+            thread = threading.Thread(target=lambda: results.extend(stream))
+            thread.start()
+            self.assertTrue(second_searched.wait(5))
+            release.set()
+            thread.join(5)
+        
+        self.assertEqual([track.name for track, _ in results], ["Song 0", "Song 1", "Song 2", "Song 3"])
+
+
+class FindBestMatchTestCase(unittest.TestCase):
+    """Test case for find_best_match."""
+    
+    def setUp(self):
+        """Create the track to match."""
+        self.track = Track(name="Blinding Lights", artist="The Weeknd", album="After Hours", duration_ms=200000)
+    
+    def test_exact_match(self):
+        """An identical candidate is returned."""
+        candidate = Track(name="Blinding Lights", artist="The Weeknd", album="After Hours")
+        self.assertIs(matching.find_best_match(self.track, [candidate]), candidate)
+    
+    def test_unrelated_candidates_are_rejected(self):
+        """Candidates below MATCH_SCORE_CUTOFF give no match."""
+        candidates = [Track(name="Bohemian Rhapsody", artist="Queen", duration_ms=200000)]
+        self.assertIsNone(matching.find_best_match(self.track, candidates))
+        self.assertIsNone(matching.find_best_match(self.track, []))
+    
+    def test_duration_bonus_lifts_a_near_miss_over_the_cutoff(self):
+        """A candidate scoring just under the cutoff matches only when its duration agrees."""
+        near_miss = dict(name="Shining Lights", artist="The Weeknd")
+        
+        self.assertIsNone(matching.find_best_match(self.track, [Track(**near_miss)]))
+        candidate = Track(**near_miss, duration_ms=200000)
+        self.assertIs(matching.find_best_match(self.track, [candidate]), candidate)
+    
+    def test_duration_breaks_ties(self):
+        """Among equally named candidates the one with the closest duration wins."""
+        far = Track(name="Blinding Lights", artist="The Weeknd", isrc="A", duration_ms=100000)
+        close = Track(name="Blinding Lights", artist="The Weeknd", isrc="B", duration_ms=199000)
+        
+        self.assertIs(matching.find_best_match(self.track, [far, close]), close)
+    
+    def test_duplicate_candidates_keep_the_first(self):
+        """Candidates with the same ISRC are scored once, keeping the first one."""
+        first = Track(name="Blinding Lights", artist="The Weeknd", isrc="X")
+        second = Track(name="Blinding Lights", artist="The Weeknd", isrc="X", duration_ms=200000)
+        
+        self.assertIs(matching.find_best_match(self.track, [first, second]), first)
+
+
+class DeduplicateTracksTestCase(unittest.TestCase):
+    """Test case for deduplicate_tracks."""
+    
+    def test_keeps_first_occurrence_in_order(self):
+        """Case-insensitive duplicates are dropped, keeping the first one and the order."""
+        first = Track(name="Song", artist="Artist")
+        tracks = [first, Track(name="Other", artist="Artist"), Track(name="SONG", artist="artist")]
+        
+        unique = matching.deduplicate_tracks(tracks)
+        
+        self.assertEqual([track.name for track in unique], ["Song", "Other"])
+        self.assertIs(unique[0], first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Tests for the Playlist model.
+"""
+
+import unittest
+import os
+import sys
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from models.track import Track
+from models.playlist import Playlist
+
+
+def make_track(track_id):
+    """Build a track with a Spotify ID."""
+    return Track(name=f"Song {track_id}", artist="Artist", platform_ids={'spotify': track_id})
+
+
+class PlaylistRemoveTrackTestCase(unittest.TestCase):
+    """Test case for Playlist.remove_track."""
+    
+    def setUp(self):
+        """Create a playlist with a few tracks."""
+        self.playlist = Playlist(id='1', name='Test', platform='spotify')
+        for track_id in ('a', 'b', 'c', 'a'):
+            self.playlist.add_track(make_track(track_id))
+    
+    def track_ids(self):
+        """IDs of the playlist's tracks, in order."""
+        return [track.get_platform_id('spotify') for track in self.playlist.tracks]
+    
+    def test_remove_keeps_order(self):
+        """Removing a track keeps the order of the others."""
+        self.assertTrue(self.playlist.remove_track('b'))
+        self.assertEqual(self.track_ids(), ['a', 'c', 'a'])
+    
+    def test_remove_duplicate_removes_first_copy(self):
+        """Only the first track with a duplicated ID is removed."""
+        self.assertTrue(self.playlist.remove_track('a'))
+        self.assertEqual(self.track_ids(), ['b', 'c', 'a'])
+    
+    def test_remove_unknown_track(self):
+        """Unknown IDs and tracks without an ID on the platform are left alone."""
+        self.playlist.add_track(Track(name="Local", artist="Artist"))
+        self.assertFalse(self.playlist.remove_track('x'))
+        self.assertEqual(len(self.playlist.tracks), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for the outbound API rate limiters.
+"""
+
+import unittest
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import MagicMock, patch
+
+import requests
+from urllib3.util.retry import Retry
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from services import ratelimit
+from services.ratelimit import RateLimitedAdapter, TokenBucket
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    """Test case for TokenBucket."""
+    
+    def setUp(self):
+        """Run the bucket on a fake clock that sleeping advances."""
+        self.now = 100.0
+        self.sleeps = []
+        
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+        
+        for name, fake in (('monotonic', lambda: self.now), ('sleep', sleep)):
+            patcher = patch.object(ratelimit.time, name, side_effect=fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_burst_does_not_block(self):
+        """A full bucket hands out `burst` tokens without waiting."""
+        bucket = TokenBucket(rate=2.0, burst=3)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(self.sleeps, [])
+    
+    def test_empty_bucket_blocks_until_refilled(self):
+        """Once empty, acquire waits as long as one token takes to refill."""
+        bucket = TokenBucket(rate=2.0, burst=1)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.sleeps, [0.5])
+    
+    def test_refill_is_capped_at_burst(self):
+        """Idle time refills the bucket to `burst` and no further."""
+        bucket = TokenBucket(rate=2.0, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.now += 60
+        
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(self.sleeps, [0.5])
+
+
+class RateLimitedAdapterTestCase(unittest.TestCase):
+    """Test case for RateLimitedAdapter."""
+    
+    def setUp(self):
+        """Serve two 503s and then a 200 from a local server."""
+        statuses = [503, 503, 200]
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(statuses.pop(0))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+    
+    def test_retries_take_a_token_each(self):
+        """urllib3's retries of a request are paced like the first attempt."""
+        limiter = MagicMock()
+        retry = Retry(total=3, backoff_factor=0, status_forcelist=(503,), raise_on_status=False)
+        session = requests.Session()
+        session.mount('http://', RateLimitedAdapter(limiter, max_retries=retry))
+        
+        response = session.get(f"http://127.0.0.1:{self.server.server_port}/")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(limiter.acquire.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the shared search cache.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from models.track import Track
+from services import cache as disk_cache
+from utils.search_cache import SearchCache
+
+
+class SearchCacheKeyTestCase(unittest.TestCase):
+    """Test case for SearchCache.key."""
+    
+    def test_isrc_key(self):
+        """Tracks with an ISRC are keyed by it, whatever their name."""
+        track = Track(name="Song (Live)", artist="Artist", isrc="usabc1234567")
+        self.assertEqual(SearchCache.key('spotify', track), 'spotify:isrc:USABC1234567')
+    
+    def test_live_and_studio_versions_get_different_keys(self):
+        """A live version must not share the studio version's cached match."""
+        studio = Track(name="Song", artist="Artist")
+        live = Track(name="Song (Live)", artist="Artist")
+        self.assertNotEqual(SearchCache.key('spotify', studio), SearchCache.key('spotify', live))
+    
+    def test_remix_and_featured_versions_get_different_keys(self):
+        """Remixes and featured-artist credits keep separate keys."""
+        keys = {
+            SearchCache.key('spotify', Track(name=name, artist="Artist"))
+            for name in ("Song", "Song (Remix)", "Song (feat. Other)")
+        }
+        self.assertEqual(len(keys), 3)
+    
+    def test_key_ignores_case(self):
+        """Keys are case-insensitive and scoped to the platform."""
+        lower = Track(name="song", artist="artist")
+        upper = Track(name="SONG", artist="ARTIST")
+        self.assertEqual(SearchCache.key('spotify', lower), SearchCache.key('spotify', upper))
+        self.assertNotEqual(SearchCache.key('spotify', lower), SearchCache.key('apple_music', lower))
+
+
+class SearchCacheStoreTestCase(unittest.TestCase):
+    """Test case for storing and reading matches."""
+    
+    def setUp(self):
+        """Point the disk cache at a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = SearchCache()
+        self.cache._disk.path = os.path.join(self.tmpdir.name, 'matches.sqlite3')
+    
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        if self.cache._disk._conn is not None:
+            self.cache._disk._conn.close()
+        self.tmpdir.cleanup()
+    
+    def test_match_is_read_back_from_disk(self):
+        """A stored match survives a fresh in-memory cache."""
+        track = Track(name="Song", artist="Artist")
+        match = Track(name="Song", artist="Artist", platform_ids={'spotify': 'abc'})
+        key = SearchCache.key('spotify', track)
+        self.cache.set_many({key: match})
+        
+        self.cache._memory.clear()
+        found = self.cache.get_many([key])
+        self.assertEqual(found[key].get_platform_id('spotify'), 'abc')
+    
+    def test_expired_matches_are_purged_after_the_first_purge(self):
+        """A long-running process keeps purging expired matches, not just once."""
+        self.cache.set_many({'spotify:isrc:first': Track(name="First", artist="Artist")})
+        
+        expired = time.time() - self.cache.isrc_ttl - 1
+        with patch.object(disk_cache.time, 'time', return_value=expired):
+            self.cache._disk.set('spotify:isrc:old', (expired, Track(name="Old", artist="Artist")))
+        
+        self.cache._disk._next_purge = time.monotonic()
+        self.cache.set_many({'spotify:isrc:new': Track(name="New", artist="Artist")})
+        
+        self.assertIsNone(self.cache._disk.get('spotify:isrc:old'))
+        self.assertIsNotNone(self.cache._disk.get('spotify:isrc:new'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the platform services' batched track searches.
+"""
+
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from models.track import Track
+from services.apple_music import AppleMusicService
+from services.spotify import SpotifyService
+
+
+def spotify_item(track_id, name, artist, isrc=None):
+    """Build a Spotify track object as returned by the Web API."""
+    return {
+        'id': track_id,
+        'uri': f"spotify:track:{track_id}",
+        'name': name,
+        'artists': [{'name': artist}],
+        'external_ids': {'isrc': isrc} if isrc else {}
+    }
+
+
+def apple_song(song_id, name, artist, isrc=None):
+    """Build an Apple Music catalog song as returned by the API."""
+    return {
+        'id': song_id,
+        'attributes': {'name': name, 'artistName': artist, 'isrc': isrc}
+    }
+
+
+class SpotifySearchTracksTestCase(unittest.TestCase):
+    """Test case for SpotifyService.search_tracks."""
+    
+    def setUp(self):
+        """Create a service with a mocked Spotify client."""
+        with patch.object(SpotifyService, '_initialize_client'):
+            self.service = SpotifyService()
+        self.service.sp = MagicMock()
+    
+    def test_bulk_misses_only_get_a_text_search(self):
+        """Tracks the bulk ID and ISRC lookups missed aren't looked up by ID or ISRC again."""
+        sp = self.service.sp
+        sp.tracks.return_value = {'tracks': [None]}
+        sp.search.side_effect = [
+            {'tracks': {'items': []}},
+            {'tracks': {'items': [spotify_item('found', 'Song', 'Artist')]}}
+        ]
+        
+        track = Track(name="Song", artist="Artist", isrc="USABC1234567", platform_ids={'spotify': 'gone'})
+        results = self.service.search_tracks([track])
+        
+        self.assertEqual(results[0].get_platform_id('spotify'), 'found')
+        sp.tracks.assert_called_once()
+        self.assertEqual(sp.search.call_count, 2)
+        self.assertTrue(sp.search.call_args_list[1].kwargs['q'].startswith('track:'))
+    
+    def test_bulk_hits_skip_the_search(self):
+        """Tracks resolved by ISRC in bulk aren't searched again."""
+        sp = self.service.sp
+        sp.search.return_value = {'tracks': {'items': [spotify_item('hit', 'Song', 'Artist', 'USABC1234567')]}}
+        
+        results = self.service.search_tracks([Track(name="Song", artist="Artist", isrc="usabc1234567")])
+        
+        self.assertEqual(results[0].get_platform_id('spotify'), 'hit')
+        sp.search.assert_called_once()
+
+
+class AppleMusicSearchTracksTestCase(unittest.TestCase):
+    """Test case for AppleMusicService.search_tracks."""
+    
+    def setUp(self):
+        """Create a service with a mocked request helper."""
+        self.service = AppleMusicService("developer-token")
+        self.service._make_request = MagicMock()
+    
+    def test_bulk_misses_only_get_a_text_search(self):
+        """Tracks the bulk ID and ISRC lookups missed aren't looked up by ID or ISRC again."""
+        self.service._make_request.side_effect = [
+            {'data': []},
+            {'data': []},
+            {'results': {'songs': {'data': [apple_song('found', 'Song', 'Artist')]}}}
+        ]
+        
+        track = Track(name="Song", artist="Artist", isrc="USABC1234567", platform_ids={'apple_music': 'gone'})
+        results = self.service.search_tracks([track])
+        
+        self.assertEqual(results[0].get_platform_id('apple_music'), 'found')
+        endpoints = [call.args[1] for call in self.service._make_request.call_args_list]
+        self.assertEqual(endpoints, ["catalog/us/songs", "catalog/us/songs", "catalog/us/search"])
+    
+    def test_bulk_hits_skip_the_search(self):
+        """Tracks resolved by ISRC in bulk aren't searched again."""
+        self.service._make_request.return_value = {'data': [apple_song('hit', 'Song', 'Artist', 'USABC1234567')]}
+        
+        results = self.service.search_tracks([Track(name="Song", artist="Artist", isrc="usabc1234567")])
+        
+        self.assertEqual(results[0].get_platform_id('apple_music'), 'hit')
+        self.service._make_request.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
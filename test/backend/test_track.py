@@ -0,0 +1,66 @@
+"""
+Tests for the Track model.
+"""
+
+import unittest
+import os
+import pickle
+import sys
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from models.track import Track
+
+
+class TrackTestCase(unittest.TestCase):
+    """Test case for building Track objects."""
+    
+    def test_null_album(self):
+        """A null album, as some API payloads send, is accepted and matches as empty."""
+        track = Track.from_dict({'name': "Song", 'artist': "Artist", 'album': None})
+        
+        self.assertIsNone(track.album)
+        self.assertEqual(track._album_lc, "")
+
+
+class TrackPickleTestCase(unittest.TestCase):
+    """Test case for pickling Track objects."""
+    
+    def restore(self, state):
+        """Build a track from a pickle state."""
+        track = Track.__new__(Track)
+        track.__setstate__(state)
+        return track
+    
+    def test_round_trip_rebuilds_derived_fields(self):
+        """A pickled track comes back equal, with its matching keys recomputed."""
+        track = Track(name="Song (Live)", artist="Artist", album="Album", platform_ids={'spotify': 'abc'})
+        
+        restored = pickle.loads(pickle.dumps(track))
+        
+        self.assertEqual(restored, track)
+        self.assertEqual(restored._dedup_key, track._dedup_key)
+        self.assertEqual(restored._clean_title, "Song")
+    
+    def test_missing_optional_field_gets_its_default(self):
+        """Fields added after a track was pickled fall back to their default."""
+        track = self.restore({'name': "Song", 'artist': "Artist"})
+        
+        self.assertEqual(track.album, "")
+        self.assertIsNone(track.isrc)
+        self.assertFalse(track.explicit)
+    
+    def test_missing_required_field_is_rejected(self):
+        """A state without a required field raises TypeError instead of restoring MISSING."""
+        with self.assertRaises(TypeError):
+            self.restore({'name': "Song"})
+    
+    def test_non_dict_state_is_rejected(self):
+        """States from the old slot-tuple format raise TypeError."""
+        with self.assertRaises(TypeError):
+            self.restore((None, {'name': "Song", 'artist': "Artist"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
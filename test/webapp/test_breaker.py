@@ -0,0 +1,118 @@
+"""Tests for the backend circuit breaker."""
+
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import requests
+
+# Add the webapp directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../webapp')))
+
+from utils import breaker
+from utils.breaker import CircuitBreaker, CircuitBreakerError
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    """Test case for the CircuitBreaker state transitions."""
+    
+    def setUp(self):
+        """Create a breaker on a controllable clock."""
+        self.now = 1000.0
+        patcher = patch.object(breaker.time, 'monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(fail_max=3, reset_timeout=30)
+    
+    def open_breaker(self):
+        """Record enough failures to open the breaker."""
+        for _ in range(3):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+    
+    def test_opens_after_fail_max_failures(self):
+        """The breaker stays closed below fail_max and opens at it."""
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.before_call()
+        
+        self.breaker.record_failure()
+        with self.assertRaises(CircuitBreakerError):
+            self.breaker.before_call()
+    
+    def test_success_resets_the_failure_count(self):
+        """A success between failures keeps the breaker closed."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        
+        self.breaker.before_call()
+    
+    def test_fails_fast_until_reset_timeout(self):
+        """While open, calls fail fast until reset_timeout has passed."""
+        self.open_breaker()
+        
+        self.now += 29
+        with self.assertRaises(CircuitBreakerError):
+            self.breaker.before_call()
+    
+    def test_successful_trial_closes(self):
+        """After reset_timeout one trial call goes through; its success closes the breaker."""
+        self.open_breaker()
+        self.now += 30
+        
+        self.breaker.before_call()
+        with self.assertRaises(CircuitBreakerError):
+            self.breaker.before_call()
+        
+        self.breaker.record_success()
+        self.breaker.before_call()
+    
+    def test_failed_trial_reopens(self):
+        """A failed trial call keeps the breaker open for another reset_timeout."""
+        self.open_breaker()
+        self.now += 30
+        
+        self.breaker.before_call()
+        self.breaker.record_failure()
+        
+        self.now += 29
+        with self.assertRaises(CircuitBreakerError):
+            self.breaker.before_call()
+
+class CallBackendTestCase(unittest.TestCase):
+    """Test case for call_backend."""
+    
+    def setUp(self):
+        """Use a fresh breaker and a mocked session."""
+        self.breaker = CircuitBreaker(fail_max=1)
+        for name, value in (('backend_breaker', self.breaker), ('_session', MagicMock())):
+            patcher = patch.object(breaker, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_request_exception_is_recorded(self):
+        """Any RequestException counts as a failure and is re-raised."""
+        breaker._session.request.side_effect = requests.exceptions.ChunkedEncodingError()
+        
+        with self.assertRaises(requests.RequestException):
+            breaker.call_backend('GET', 'http://backend/api/status/1')
+        with self.assertRaises(CircuitBreakerError):
+            breaker.call_backend('GET', 'http://backend/api/status/1')
+    
+    @patch.object(breaker.time, 'sleep')
+    def test_overload_is_retried_then_recorded(self, sleep):
+        """Retryable statuses are retried, and a final failure is recorded."""
+        breaker._session.request.return_value = MagicMock(status_code=503)
+        
+        response = breaker.call_backend('GET', 'http://backend/api/status/1')
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(breaker._session.request.call_count, breaker.MAX_ATTEMPTS)
+        with self.assertRaises(CircuitBreakerError):
+            breaker.call_backend('GET', 'http://backend/api/status/1')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
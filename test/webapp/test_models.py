@@ -0,0 +1,50 @@
+"""Tests for the BeatBridge web application models."""
+
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add the webapp directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../webapp')))
+
+from create_db import create_app
+from models import db, ConversionJob
+
+class ConversionJobTestCase(unittest.TestCase):
+    """Test case for the ConversionJob model."""
+    
+    def setUp(self):
+        """Create an in-memory database with one job."""
+        with patch.dict(os.environ, {'DATABASE_URL': 'sqlite://'}):
+            self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        
+        self.table = ConversionJob.__table__
+        self.table.create(db.engine)
+        db.session.execute(self.table.insert().values(
+            id='job-1', source_platform='spotify', destination_platform='apple_music', source_playlist_id='abc'
+        ))
+        db.session.commit()
+    
+    def tearDown(self):
+        """Drop the database."""
+        db.session.remove()
+        self.table.drop(db.engine)
+        self.app_context.pop()
+    
+    def job_row(self):
+        """Read the stored job."""
+        return db.session.execute(self.table.select()).first()
+    
+    def test_failed_tracks_round_trip(self):
+        """Failed tracks are stored and read back as a list of dictionaries."""
+        failed = [{'name': 'Song', 'artist': 'Artist', 'reason': 'Not found'}]
+        db.session.execute(self.table.update().values(failed_tracks=failed))
+        db.session.commit()
+        self.assertEqual(self.job_row().failed_tracks, failed)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
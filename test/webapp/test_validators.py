@@ -0,0 +1,125 @@
+"""Tests for the BeatBridge web application validators and helpers."""
+
+import re
+import unittest
+import os
+import sys
+
+# Add the webapp directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../webapp')))
+
+from utils.helpers import extract_playlist_id
+from utils.validators import parse_playlist_url, validate_email, validate_playlist_url
+
+# The regex validate_email replaced; it must accept and reject the same addresses
+OLD_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+class ValidateEmailTestCase(unittest.TestCase):
+    """Test case for validate_email."""
+    
+    def test_matches_the_old_regex(self):
+        """Valid and invalid addresses are judged as the old regex judged them."""
+        emails = [
+            'user@example.com', 'first.last+tag@sub.example.co.uk', 'a_b%c-d@host-1.io',
+            'USER@EXAMPLE.ORG', 'x@y.z', 'user@example.c0m', 'user@@example.com',
+            'user@example', '@example.com', 'user@.com', 'user@exa mple.com', 'us er@example.com',
+            'user@example.cöm', 'usér@example.com', 'user@exa_mple.com', 'user@example..com',
+            'a@b@c.com', 'user@example.com.', 'user@123.45', ''
+        ]
+        for email in emails:
+            with self.subTest(email=email):
+                self.assertEqual(validate_email(email), bool(OLD_EMAIL_RE.fullmatch(email)))
+    
+    def test_none_is_invalid(self):
+        """A missing email is invalid."""
+        self.assertFalse(validate_email(None))
+
+class ValidatePlaylistUrlTestCase(unittest.TestCase):
+    """Test case for validate_playlist_url."""
+    
+    def test_fast_paths_accept_canonical_urls(self):
+        """The usual link for each platform is accepted."""
+        urls = {
+            'spotify': 'https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M?si=abc',
+            'apple_music': 'https://music.apple.com/us/playlist/todays-hits/pl.f4d106fed2bd41149aaacabb233eb5eb',
+            'youtube_music': 'https://music.youtube.com/playlist?list=PL4fGSI1pDJn5kI81J1fYWK5eZRl1zJ5kM'
+        }
+        for platform, url in urls.items():
+            with self.subTest(platform=platform):
+                self.assertEqual(validate_playlist_url(url, platform), (True, ""))
+    
+    def test_fallbacks_accept_other_spellings(self):
+        """Links that miss the prefix fast path are still accepted by the full checks."""
+        urls = {
+            'spotify': 'http://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M',
+            'apple_music': 'http://music.apple.com/us/playlist/hits/pl.abc123',
+            'youtube_music': 'http://music.youtube.com/playlist?list=PLabc_123-x'
+        }
+        for platform, url in urls.items():
+            with self.subTest(platform=platform):
+                self.assertEqual(validate_playlist_url(url, platform), (True, ""))
+    
+    def test_error_messages(self):
+        """Rejected URLs get the message for the check they failed."""
+        cases = [
+            ('spotify', 'https://example.com/playlist/abc', "doesn't appear to be a Spotify URL"),
+            ('spotify', 'https://open.spotify.com/album/abc', "doesn't appear to be a playlist URL"),
+            ('spotify', 'https://open.spotify.com/playlist/', "Could not find a valid playlist ID"),
+            ('apple_music', 'https://example.com/playlist/x', "doesn't appear to be an Apple Music URL"),
+            ('apple_music', 'https://music.apple.com/us/album/x/1', "doesn't appear to be a playlist URL"),
+            ('youtube_music', 'https://www.youtube.com/playlist?list=PL1', "doesn't appear to be a YouTube Music URL"),
+            ('youtube_music', 'https://music.youtube.com/watch?v=abc', "doesn't appear to be a playlist URL"),
+            ('deezer', 'https://deezer.com/playlist/1', "Unsupported platform"),
+            ('spotify', 'open.spotify.com/playlist/abc', "Invalid URL format"),
+            ('spotify', '', "Please enter a playlist URL")
+        ]
+        for platform, url, message in cases:
+            with self.subTest(url=url):
+                is_valid, error = validate_playlist_url(url, platform)
+                self.assertFalse(is_valid)
+                self.assertIn(message, error)
+
+class ExtractPlaylistIdTestCase(unittest.TestCase):
+    """Test case for extract_playlist_id."""
+    
+    def test_extracts_id_per_platform(self):
+        """Each platform's pattern extracts the playlist ID."""
+        cases = [
+            ('spotify', 'https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M?si=abc', '37i9dQZF1DXcBWIGoYBM5M'),
+            ('spotify', 'spotify:playlist:37i9dQZF1DXcBWIGoYBM5M', '37i9dQZF1DXcBWIGoYBM5M'),
+            ('apple_music', 'https://music.apple.com/us/playlist/hits/pl.abc123', 'pl.abc123'),
+            ('youtube_music', 'https://music.youtube.com/playlist?list=PLabc_123-x', 'PLabc_123-x')
+        ]
+        for platform, url, playlist_id in cases:
+            with self.subTest(platform=platform, url=url):
+                self.assertEqual(extract_playlist_id(url, platform), playlist_id)
+    
+    def test_unknown_platform_or_empty_url(self):
+        """Unknown platforms and empty URLs give None."""
+        self.assertIsNone(extract_playlist_id('https://deezer.com/playlist/1', 'deezer'))
+        self.assertIsNone(extract_playlist_id('', 'spotify'))
+
+class ParsePlaylistUrlTestCase(unittest.TestCase):
+    """Test case for parse_playlist_url."""
+    
+    def test_returns_the_extracted_id(self):
+        """A valid URL gives the same playlist ID as extract_playlist_id."""
+        urls = {
+            'spotify': 'https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M?si=abc',
+            'apple_music': 'http://music.apple.com/us/playlist/hits/pl.abc123',
+            'youtube_music': 'https://music.youtube.com/playlist?list=PLabc_123-x'
+        }
+        for platform, url in urls.items():
+            with self.subTest(platform=platform):
+                self.assertEqual(parse_playlist_url(url, platform), (True, "", extract_playlist_id(url, platform)))
+    
+    def test_invalid_url_has_no_id(self):
+        """A rejected URL gives no playlist ID."""
+        is_valid, message, playlist_id = parse_playlist_url('https://open.spotify.com/album/abc', 'spotify')
+        self.assertFalse(is_valid)
+        self.assertTrue(message)
+        self.assertIsNone(playlist_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,23 +1,39 @@
 import os
 import secrets
 import json
+import time
 import requests
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash
+from flask import Flask, Response, render_template, request, redirect, url_for, session, jsonify, flash
 from flask_oauthlib.client import OAuth
 from dotenv import load_dotenv
-from utils.helpers import extract_playlist_id, get_platform_name
-from utils.validators import validate_playlist_url
+from utils.helpers import get_platform_name
+from utils.validators import parse_playlist_url
+from utils.breaker import call_backend, CircuitBreakerError
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (from .env outside production)
+if os.getenv('FLASK_ENV') != 'production':
+    load_dotenv()
 
 app = Flask(__name__)
+# Sessions are Flask's default signed cookies, so no request touches a
+# server-side session store
 app.secret_key = os.getenv("FLASK_SECRET_KEY", secrets.token_hex(16))
-app.config['SESSION_TYPE'] = 'filesystem'
 
 # Backend service URL
 BACKEND_URL = os.getenv('CONVERSION_SERVICE_URL', 'http://localhost:5001')
 
+# Auth view for each platform; each handles both source and destination auth
+AUTH_ROUTES = {
+    'spotify': 'spotify_auth',
+    'apple_music': 'apple_music_auth',
+    'youtube_music': 'youtube_music_auth'
+}
+
+# How often a status stream checks the backend, and how long one stream stays
+# open before the browser reconnects (seconds)
+STATUS_STREAM_INTERVAL = 2
+STATUS_STREAM_DURATION = 50
+
 # Set up OAuth
 oauth = OAuth(app)
 
@@ -61,18 +77,12 @@ def process():
         flash("Source and destination platforms cannot be the same.", "error")
         return redirect(url_for('index'))
     
-    # Validate playlist URL
-    valid, message = validate_playlist_url(playlist_url, source_platform)
+    # Validate playlist URL and extract its playlist ID
+    valid, message, playlist_id = parse_playlist_url(playlist_url, source_platform)
     if not valid:
         flash(message, "error")
         return redirect(url_for('index'))
     
-    # Extract playlist ID from URL
-    playlist_id = extract_playlist_id(playlist_url, source_platform)
-    if not playlist_id:
-        flash("Could not extract playlist ID from the URL. Please check the URL and try again.", "error")
-        return redirect(url_for('index'))
-    
     # Store in session for later use
     session['source_platform'] = source_platform
     session['destination_platform'] = destination_platform
@@ -84,21 +94,12 @@ def process():
         del session['conversion_result']
     
     # Determine auth flow based on source platform
-    if source_platform == 'spotify':
-        return redirect(url_for('spotify_auth'))
-    elif source_platform == 'apple_music':
-        # For Apple Music, we need to use Apple's MusicKit JS
-        # For this example, we'll simulate auth
-        session['source_auth_complete'] = True
-        return redirect(url_for('destination_auth'))
-    elif source_platform == 'youtube_music':
-        # For YouTube Music, use Google OAuth
-        # For this example, we'll simulate auth
-        session['source_auth_complete'] = True
-        return redirect(url_for('destination_auth'))
-    else:
+    auth_route = AUTH_ROUTES.get(source_platform)
+    if not auth_route:
         flash(f"Unsupported source platform: {source_platform}", "error")
         return redirect(url_for('index'))
+    
+    return redirect(url_for(auth_route))
 
 @app.route('/destination-auth')
 def destination_auth():
@@ -109,19 +110,12 @@ def destination_auth():
         flash("Session expired. Please try again.", "error")
         return redirect(url_for('index'))
     
-    if destination == 'spotify':
-        return redirect(url_for('spotify_auth', is_destination=True))
-    elif destination == 'apple_music':
-        # Simulate Apple Music auth
-        session['destination_auth_complete'] = True
-        return redirect(url_for('convert_playlist'))
-    elif destination == 'youtube_music':
-        # Simulate YouTube Music auth
-        session['destination_auth_complete'] = True
-        return redirect(url_for('convert_playlist'))
-    else:
+    auth_route = AUTH_ROUTES.get(destination)
+    if not auth_route:
         flash(f"Unsupported destination platform: {destination}", "error")
         return redirect(url_for('index'))
+    
+    return redirect(url_for(auth_route, is_destination=True))
 
 @app.route('/spotify-auth')
 def spotify_auth():
@@ -221,7 +215,8 @@ def convert_playlist():
     
     # Make API call to our backend conversion service
     try:
-        response = requests.post(
+        response = call_backend(
+            'POST',
             f"{BACKEND_URL}/api/convert",
             json=payload,
             timeout=10  # 10-second timeout
@@ -238,6 +233,9 @@ def convert_playlist():
             flash(f"Failed to start conversion: {result.get('message')}", "error")
             return redirect(url_for('index'))
             
+    except CircuitBreakerError:
+        flash("The conversion service is temporarily unavailable. Please try again in a minute.", "error")
+        return redirect(url_for('index'))
     except requests.RequestException as e:
         flash(f"Error communicating with conversion service: {str(e)}", "error")
         return redirect(url_for('index'))
@@ -266,7 +264,8 @@ def conversion_progress():
 def check_status(job_id):
     """API endpoint to check conversion status"""
     try:
-        response = requests.get(
+        response = call_backend(
+            'GET',
             f"{BACKEND_URL}/api/status/{job_id}",
             timeout=5
         )
@@ -285,12 +284,55 @@ def check_status(job_id):
         
         return jsonify(result)
         
+    except CircuitBreakerError:
+        # Keep the progress page polling until the backend recovers
+        return jsonify({
+            'success': False,
+            'status': 'pending',
+            'message': 'backend temporarily unavailable'
+        }), 503
     except requests.RequestException as e:
         return jsonify({
             'success': False,
             'message': f"Error communicating with conversion service: {str(e)}"
         }), 500
 
+@app.route('/api/status-stream/<job_id>')
+def status_stream(job_id):
+    """Server-sent events stream of conversion status, sent only when it changes"""
+    def events():
+        # Ask the browser to reconnect quickly when this stream ends
+        yield "retry: 1000\n\n"
+        
+        last_state = None
+        deadline = time.monotonic() + STATUS_STREAM_DURATION
+        
+        while time.monotonic() < deadline:
+            try:
+                response = call_backend('GET', f"{BACKEND_URL}/api/status/{job_id}", timeout=5)
+                if response.status_code == 404:
+                    state = {'success': False, 'status': 'failed', 'message': 'Job not found'}
+                else:
+                    state = response.json()
+            except CircuitBreakerError:
+                state = {'success': False, 'status': 'pending', 'message': 'backend temporarily unavailable'}
+            except (requests.RequestException, ValueError) as e:
+                state = {'success': False, 'status': 'pending', 'message': f"Error communicating with conversion service: {str(e)}"}
+            
+            if state != last_state:
+                yield f"data: {json.dumps(state)}\n\n"
+                last_state = state
+            
+            if state.get('status') in ('completed', 'failed'):
+                return
+            
+            time.sleep(STATUS_STREAM_INTERVAL)
+    
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Don't let a proxy buffer the stream
+    })
+
 @app.route('/result')
 def show_result():
     """Show conversion result page"""
@@ -1,15 +1,15 @@
 import os
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from .env; production gets them from the real
+# environment, so skip the file read there
+if os.getenv('FLASK_ENV') != 'production':
+    load_dotenv()
 
 class Config:
     """Base configuration"""
     SECRET_KEY = os.getenv('FLASK_SECRET_KEY', 'dev-key-change-in-production')
-    SESSION_TYPE = 'filesystem'
     SESSION_PERMANENT = False
-    SESSION_USE_SIGNER = True
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour
     
     # API Configuration
@@ -60,7 +60,9 @@ config = {
     'default': DevelopmentConfig
 }
 
+# Configuration for the current environment, resolved once at import
+_active_config = config.get(os.getenv('FLASK_ENV', 'default'), config['default'])
+
 def get_config():
     """Get current configuration based on environment"""
-    environment = os.getenv('FLASK_ENV', 'default')
-    return config.get(environment, config['default'])
\ No newline at end of file
+    return _active_config
\ No newline at end of file
@@ -1,21 +1,34 @@
 """Database initialization script for BeatBridge."""
 
 import os
+import orjson
 from dotenv import load_dotenv
 from flask import Flask
 from models import db
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (from .env outside production)
+if os.getenv('FLASK_ENV') != 'production':
+    load_dotenv()
+
+def _json_dumps(value):
+    """Encode a JSON column value with orjson, as the str SQLAlchemy expects"""
+    return orjson.dumps(value).decode()
 
 def create_app():
     """Create Flask application for database initialization."""
     app = Flask(__name__)
     
     # Configure database
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///beatbridge.db')
+    database_uri = os.getenv('DATABASE_URL', 'sqlite:///beatbridge.db')
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    # JSON columns are encoded with orjson
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'json_serializer': _json_dumps,
+        'json_deserializer': orjson.loads
+    }
+    
     # Initialize database
     db.init_app(app)
     
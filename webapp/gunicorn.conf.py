@@ -1,13 +1,20 @@
 """Gunicorn configuration file for BeatBridge webapp"""
 
+import multiprocessing
+import os
+
 # Bind to 0.0.0.0:5000
 bind = "0.0.0.0:5000"
 
-# Number of worker processes
-workers = 3
+# Number of worker processes: 2 * cores + 1 by default, so the config scales
+# with the host; each worker costs a full copy of the app's memory, so set
+# WEB_CONCURRENCY lower on small instances
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
 
-# Number of threads per worker
-threads = 2
+# Number of threads per worker; requests mostly wait on the backend and the
+# platform APIs, and status streams hold a thread while they wait, so leave
+# room for them alongside page requests
+threads = int(os.getenv("GUNICORN_THREADS", 8))
 
 # Maximum number of pending connections
 backlog = 2048
@@ -15,12 +22,19 @@ backlog = 2048
 # Timeout in seconds for a request to complete
 timeout = 60
 
+# Seconds to hold an idle keep-alive connection open for the next request
+keepalive = 5
+
 # Restart workers after this many requests
 max_requests = 1000
 
-# Restart workers after this many seconds
+# Add up to this many requests to each worker's max_requests, so workers
+# don't all restart at once
 max_requests_jitter = 50
 
+# Seconds a restarting worker gets to finish its in-flight requests
+graceful_timeout = 30
+
 # Log level
 loglevel = "info"
 
@@ -34,8 +48,13 @@ proc_name = "beatbridge_webapp"
 # Preload the application code before worker processes are forked
 preload_app = True
 
-# Worker class
-worker_class = "sync"
+# Worker class; threaded workers keep serving while other requests wait on I/O
+worker_class = "gthread"
+
+# Keep the worker heartbeat files on tmpfs so a slow disk can't stall them;
+# /dev/shm only exists on Linux, so fall back to the default temp dir elsewhere
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
-# Automatically restart workers that have used more than this amount of memory
-worker_tmp_dir = "/dev/shm"
\ No newline at end of file
+def post_fork(server, worker):
+    """Log each worker's effective settings when it starts"""
+    server.log.info(f"Worker {worker.pid} started ({server.cfg.workers} workers x {server.cfg.threads} threads)")
\ No newline at end of file
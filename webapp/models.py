@@ -1,18 +1,24 @@
 """Database models for the BeatBridge application."""
 
 from datetime import datetime
-import json
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.mutable import MutableList
 
 db = SQLAlchemy()
 
 class ConversionJob(db.Model):
     """Model to store playlist conversion jobs."""
     
+    # Job listings filter by status and order by creation time
+    __table_args__ = (
+        db.Index('ix_job_status_created', 'status', 'created_at'),
+    )
+    
     id = db.Column(db.String(36), primary_key=True)
     source_platform = db.Column(db.String(50), nullable=False)
     destination_platform = db.Column(db.String(50), nullable=False)
-    source_playlist_id = db.Column(db.String(255), nullable=False)
+    source_playlist_id = db.Column(db.String(255), nullable=False, index=True)
     source_playlist_name = db.Column(db.String(255), nullable=True)
     destination_playlist_id = db.Column(db.String(255), nullable=True)
     destination_playlist_url = db.Column(db.String(500), nullable=True)
@@ -21,27 +27,17 @@ class ConversionJob(db.Model):
     total_tracks = db.Column(db.Integer, default=0)
     matched_tracks = db.Column(db.Integer, default=0)
     error_message = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
     
-    # Store the list of failed tracks as JSON
-    _failed_tracks = db.Column('failed_tracks', db.Text, nullable=True)
-    
-    @property
-    def failed_tracks(self):
-        """Get the failed tracks as a list of dictionaries."""
-        if self._failed_tracks:
-            return json.loads(self._failed_tracks)
-        return []
-    
-    @failed_tracks.setter
-    def failed_tracks(self, value):
-        """Set the failed tracks from a list of dictionaries."""
-        if value:
-            self._failed_tracks = json.dumps(value)
-        else:
-            self._failed_tracks = None
+    # Failed tracks as a list of dictionaries, in a JSON column (JSONB on
+    # PostgreSQL) that SQLAlchemy encodes and decodes; in-place changes to
+    # the list are tracked
+    failed_tracks = db.Column(
+        MutableList.as_mutable(db.JSON().with_variant(JSONB(), 'postgresql')),
+        nullable=True
+    )
     
     def to_dict(self):
         """Convert the model to a dictionary."""
@@ -61,7 +57,7 @@ class ConversionJob(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'failed_tracks': self.failed_tracks
+            'failed_tracks': self.failed_tracks or []
         }
     
     def __repr__(self):
@@ -73,7 +69,7 @@ class User(db.Model):
     """Model to store user information (optional for advanced features)."""
     
     id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(255), unique=True, nullable=False)
+    email = db.Column(db.String(255), unique=True, index=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=True)
     spotify_refresh_token = db.Column(db.String(255), nullable=True)
     apple_music_token = db.Column(db.String(255), nullable=True)
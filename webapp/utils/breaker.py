@@ -0,0 +1,119 @@
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Consecutive failures before the breaker opens, and how long it stays open (seconds)
+FAIL_MAX = 5
+RESET_TIMEOUT = 30
+
+# Attempts per backend call, and the backoff between them (seconds)
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 4
+
+# Backend statuses worth retrying; a POST is only retried when the backend
+# can't have started on it
+RETRY_STATUSES = (429, 502, 503, 504)
+POST_RETRY_STATUSES = (429, 503)
+
+class CircuitBreakerError(Exception):
+    """Raised instead of calling the backend while the breaker is open"""
+
+class CircuitBreaker:
+    """
+    Fail fast while the backend is down
+
+    After `fail_max` consecutive failures the breaker opens and every call
+    raises CircuitBreakerError without touching the network. Once
+    `reset_timeout` seconds have passed, one trial call is let through: if it
+    succeeds the breaker closes again, otherwise it stays open.
+    """
+
+    def __init__(self, fail_max=FAIL_MAX, reset_timeout=RESET_TIMEOUT):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Check that a call may go ahead
+
+        Raises:
+            CircuitBreakerError: If the breaker is open
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitBreakerError("Conversion service temporarily unavailable")
+            # Let this call through as the trial; others keep failing fast until it reports back
+            self._opened_at = time.monotonic()
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+# Breaker shared by every call to the conversion backend
+backend_breaker = CircuitBreaker()
+
+# Keep-alive connections to the backend, reused across requests and status polls;
+# retries are left to call_backend so they go through the breaker
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+_session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+def _backoff(attempt):
+    """Delay before retry number `attempt` (0-based): capped exponential with +/-50% jitter"""
+    delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+    return delay + random.uniform(-0.5 * delay, 0.5 * delay)
+
+def call_backend(method, url, **kwargs):
+    """
+    Call the conversion backend through the circuit breaker, retrying
+    overload responses with exponential backoff
+
+    Args:
+        method (str): HTTP method
+        url (str): Request URL
+        **kwargs: Passed to Session.request (json, timeout, ...)
+
+    Returns:
+        requests.Response: The backend's response
+
+    Raises:
+        CircuitBreakerError: If the backend has been failing and the breaker is open
+        requests.RequestException: If the request could not be completed
+    """
+    backend_breaker.before_call()
+    retry_statuses = POST_RETRY_STATUSES if method.upper() == 'POST' else RETRY_STATUSES
+
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            response = _session.request(method, url, **kwargs)
+        except requests.RequestException:
+            backend_breaker.record_failure()
+            raise
+
+        if response.status_code not in retry_statuses:
+            break
+
+        if attempt < MAX_ATTEMPTS - 1:
+            time.sleep(_backoff(attempt))
+
+    if response.status_code >= 500 or response.status_code in retry_statuses:
+        backend_breaker.record_failure()
+    else:
+        backend_breaker.record_success()
+
+    return response
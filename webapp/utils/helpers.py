@@ -1,7 +1,37 @@
 import re
 import json
 import requests
-from urllib.parse import urlparse, parse_qs
+
+# Playlist ID pattern for each platform, compiled once at import; each matches
+# every URL form the platform uses:
+#   spotify:       https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO?si=...
+#                  or spotify:playlist:37i9dQZF1DX4sWSpwq3LiO
+#   apple_music:   https://music.apple.com/us/playlist/top-100-global/pl.d25f5d1181894928af76c85c967f8f31
+#   youtube_music: https://music.youtube.com/playlist?list=RDCLAK5uy_ktw...
+PLAYLIST_ID_PATTERNS = {
+    'spotify': re.compile(r'(?:spotify\.com/playlist/|spotify:playlist:)([a-zA-Z0-9]+)'),
+    'apple_music': re.compile(r'music\.apple\.com/.+/playlist/.+/([a-zA-Z0-9.]+)'),
+    'youtube_music': re.compile(r'[?&]list=([a-zA-Z0-9_-]+)')
+}
+
+# Display names and icon classes for each platform
+_PLATFORM_NAMES = {
+    'spotify': 'Spotify',
+    'apple_music': 'Apple Music',
+    'youtube_music': 'YouTube Music',
+    'deezer': 'Deezer',
+    'tidal': 'TIDAL',
+    'amazon_music': 'Amazon Music'
+}
+
+_PLATFORM_ICONS = {
+    'spotify': 'fab fa-spotify',
+    'apple_music': 'fab fa-apple',
+    'youtube_music': 'fab fa-youtube',
+    'deezer': 'fas fa-music',
+    'tidal': 'fas fa-wave-square',
+    'amazon_music': 'fab fa-amazon'
+}
 
 def extract_playlist_id(url, platform):
     """
@@ -17,37 +47,12 @@ def extract_playlist_id(url, platform):
     if not url:
         return None
         
-    if platform == 'spotify':
-        # Spotify format: https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO?si=...
-        match = re.search(r'spotify\.com/playlist/([a-zA-Z0-9]+)', url)
-        if match:
-            return match.group(1)
-            
-        # Alternative format: spotify:playlist:37i9dQZF1DX4sWSpwq3LiO
-        match = re.search(r'spotify:playlist:([a-zA-Z0-9]+)', url)
-        if match:
-            return match.group(1)
-            
-    elif platform == 'apple_music':
-        # Apple Music format: https://music.apple.com/us/playlist/top-100-global/pl.d25f5d1181894928af76c85c967f8f31
-        match = re.search(r'music\.apple\.com/.+/playlist/.+/(pl\.[a-zA-Z0-9]+)', url)
-        if match:
-            return match.group(1)
-            
-        # Alternative format with just the ID
-        match = re.search(r'music\.apple\.com/.+/playlist/.+/([a-zA-Z0-9\.]+)', url)
-        if match:
-            return match.group(1)
-            
-    elif platform == 'youtube_music':
-        # YouTube Music format: https://music.youtube.com/playlist?list=RDCLAK5uy_ktw...
-        parsed_url = urlparse(url)
-        query_params = parse_qs(parsed_url.query)
-        
-        if 'list' in query_params:
-            return query_params['list'][0]
+    pattern = PLAYLIST_ID_PATTERNS.get(platform)
+    if not pattern:
+        return None
     
-    return None
+    match = pattern.search(url)
+    return match.group(1) if match else None
 
 def get_platform_name(platform_id):
     """
@@ -59,16 +64,7 @@ def get_platform_name(platform_id):
     Returns:
         str: User-friendly platform name
     """
-    platform_names = {
-        'spotify': 'Spotify',
-        'apple_music': 'Apple Music',
-        'youtube_music': 'YouTube Music',
-        'deezer': 'Deezer',
-        'tidal': 'TIDAL',
-        'amazon_music': 'Amazon Music'
-    }
-    
-    return platform_names.get(platform_id, platform_id.title())
+    return _PLATFORM_NAMES.get(platform_id) or platform_id.title()
 
 def format_artist_name(artists):
     """
@@ -84,16 +80,28 @@ def format_artist_name(artists):
         return "Unknown Artist"
         
     if isinstance(artists[0], dict) and 'name' in artists[0]:
-        artist_names = [artist['name'] for artist in artists]
-    else:
-        artist_names = artists
+        return format_artist_names([artist['name'] for artist in artists])
+    
+    return format_artist_names(artists)
+
+def format_artist_names(names):
+    """
+    Format a list of artist names into a string, for callers that already
+    have plain names
+    
+    Args:
+        names (list): List of artist names
         
-    if len(artist_names) == 1:
-        return artist_names[0]
-    elif len(artist_names) == 2:
-        return f"{artist_names[0]} & {artist_names[1]}"
-    else:
-        return f"{', '.join(artist_names[:-1])} & {artist_names[-1]}"
+    Returns:
+        str: Formatted artist string (e.g., "Artist1, Artist2 & Artist3")
+    """
+    if not names:
+        return "Unknown Artist"
+        
+    if len(names) == 1:
+        return names[0]
+    
+    return ', '.join(names[:-1]) + ' & ' + names[-1]
 
 def truncate_string(text, max_length=50):
     """
@@ -121,16 +129,7 @@ def get_platform_icon(platform_id):
     Returns:
         str: CSS class for the platform icon
     """
-    icon_classes = {
-        'spotify': 'fab fa-spotify',
-        'apple_music': 'fab fa-apple',
-        'youtube_music': 'fab fa-youtube',
-        'deezer': 'fas fa-music',
-        'tidal': 'fas fa-wave-square',
-        'amazon_music': 'fab fa-amazon'
-    }
-    
-    return icon_classes.get(platform_id, 'fas fa-music')
+    return _PLATFORM_ICONS.get(platform_id, 'fas fa-music')
 
 def get_playlist_details(playlist_url, platform, token=None):
     """
@@ -1,5 +1,26 @@
 import re
+import string
 from urllib.parse import urlparse
+from utils.helpers import PLAYLIST_ID_PATTERNS
+
+# Validation patterns, compiled once at import; the playlist ID patterns are
+# shared with extract_playlist_id
+_SPOTIFY_ID_RE = PLAYLIST_ID_PATTERNS['spotify']
+_APPLE_ID_RE = PLAYLIST_ID_PATTERNS['apple_music']
+_YT_LIST_RE = PLAYLIST_ID_PATTERNS['youtube_music']
+_PW_UPPER_RE = re.compile(r'[A-Z]')
+_PW_LOWER_RE = re.compile(r'[a-z]')
+_PW_DIGIT_RE = re.compile(r'\d')
+_PW_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+
+# Canonical playlist URL prefixes; URLs starting with one only need the ID check
+_SPOTIFY_PREFIXES = ('https://open.spotify.com/playlist/', 'spotify:playlist:')
+_APPLE_MUSIC_PREFIX = 'https://music.apple.com/'
+_YOUTUBE_MUSIC_PREFIX = 'https://music.youtube.com/'
+
+# Characters allowed before and after the @ of an email address
+_EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + '._%+-')
+_EMAIL_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + '.-')
 
 def validate_playlist_url(url, platform):
     """
@@ -12,26 +33,38 @@ def validate_playlist_url(url, platform):
     Returns:
         tuple: (is_valid, message) - A boolean indicating if the URL is valid and an error message if not
     """
+    is_valid, message, _ = parse_playlist_url(url, platform)
+    return is_valid, message
+
+def parse_playlist_url(url, platform):
+    """
+    Validate a playlist URL and extract its playlist ID in the same pass
+    
+    Args:
+        url (str): The playlist URL to validate
+        platform (str): The platform identifier (spotify, apple_music, youtube_music)
+        
+    Returns:
+        tuple: (is_valid, message, playlist_id) - The validation result as
+            for validate_playlist_url, and the playlist ID if the URL is valid
+    """
     if not url:
-        return False, "Please enter a playlist URL."
+        return False, "Please enter a playlist URL.", None
     
     # Basic URL validation
     try:
         parsed_url = urlparse(url)
         if not parsed_url.scheme or not parsed_url.netloc:
-            return False, "Invalid URL format. Please enter a complete URL."
+            return False, "Invalid URL format. Please enter a complete URL.", None
     except Exception:
-        return False, "Invalid URL format. Please check the URL and try again."
+        return False, "Invalid URL format. Please check the URL and try again.", None
     
     # Platform-specific validation
-    if platform == 'spotify':
-        return validate_spotify_url(url)
-    elif platform == 'apple_music':
-        return validate_apple_music_url(url)
-    elif platform == 'youtube_music':
-        return validate_youtube_music_url(url)
-    else:
-        return False, f"Unsupported platform: {platform}"
+    validator = _URL_VALIDATORS.get(platform)
+    if not validator:
+        return False, f"Unsupported platform: {platform}", None
+    
+    return validator(url)
 
 def validate_spotify_url(url):
     """
@@ -41,29 +74,33 @@ def validate_spotify_url(url):
         url (str): The playlist URL to validate
         
     Returns:
-        tuple: (is_valid, message) - A boolean indicating if the URL is valid and an error message if not
+        tuple: (is_valid, message, playlist_id) - A boolean indicating if the URL is valid,
+            an error message if not, and the playlist ID if it is
     """
+    # Fast path for the usual open.spotify.com link
+    match = _SPOTIFY_ID_RE.search(url) if url.startswith(_SPOTIFY_PREFIXES) else None
+    if match:
+        return True, "", match.group(1)
+    
     # Check if URL is from Spotify domain
     if 'spotify.com' not in url and 'spotify:' not in url:
-        return False, "This doesn't appear to be a Spotify URL. Please enter a URL from open.spotify.com."
+        return False, "This doesn't appear to be a Spotify URL. Please enter a URL from open.spotify.com.", None
     
     # Check if URL is a playlist
     if 'playlist' not in url:
-        return False, "This doesn't appear to be a playlist URL. Please enter a Spotify playlist URL."
+        return False, "This doesn't appear to be a playlist URL. Please enter a Spotify playlist URL.", None
     
     # Check for playlist ID presence
+    match = _SPOTIFY_ID_RE.search(url)
+    if match:
+        return True, "", match.group(1)
+    
     if 'spotify.com/playlist/' in url:
-        match = re.search(r'spotify\.com/playlist/([a-zA-Z0-9]+)', url)
-        if not match:
-            return False, "Could not find a valid playlist ID in the URL. Please check the URL and try again."
+        return False, "Could not find a valid playlist ID in the URL. Please check the URL and try again.", None
     elif 'spotify:playlist:' in url:
-        match = re.search(r'spotify:playlist:([a-zA-Z0-9]+)', url)
-        if not match:
-            return False, "Could not find a valid playlist ID in the URI. Please use a URL from the Spotify web player."
+        return False, "Could not find a valid playlist ID in the URI. Please use a URL from the Spotify web player.", None
     else:
-        return False, "This doesn't appear to be a valid Spotify playlist URL. Please enter a URL from the Spotify web player."
-    
-    return True, ""
+        return False, "This doesn't appear to be a valid Spotify playlist URL. Please enter a URL from the Spotify web player.", None
 
 def validate_apple_music_url(url):
     """
@@ -73,25 +110,28 @@ def validate_apple_music_url(url):
         url (str): The playlist URL to validate
         
     Returns:
-        tuple: (is_valid, message) - A boolean indicating if the URL is valid and an error message if not
+        tuple: (is_valid, message, playlist_id) - A boolean indicating if the URL is valid,
+            an error message if not, and the playlist ID if it is
     """
+    # Fast path for the usual music.apple.com link
+    match = _APPLE_ID_RE.search(url) if url.startswith(_APPLE_MUSIC_PREFIX) else None
+    if match:
+        return True, "", match.group(1)
+    
     # Check if URL is from Apple Music domain
     if 'music.apple.com' not in url:
-        return False, "This doesn't appear to be an Apple Music URL. Please enter a URL from music.apple.com."
+        return False, "This doesn't appear to be an Apple Music URL. Please enter a URL from music.apple.com.", None
     
     # Check if URL is a playlist
     if '/playlist/' not in url:
-        return False, "This doesn't appear to be a playlist URL. Please enter an Apple Music playlist URL."
+        return False, "This doesn't appear to be a playlist URL. Please enter an Apple Music playlist URL.", None
     
     # Check for a valid playlist ID format
-    match = re.search(r'music\.apple\.com/.+/playlist/.+/(pl\.[a-zA-Z0-9]+)', url)
+    match = _APPLE_ID_RE.search(url)
     if not match:
-        # Try alternative format
-        match = re.search(r'music\.apple\.com/.+/playlist/.+/([a-zA-Z0-9\.]+)', url)
-        if not match:
-            return False, "Could not find a valid playlist ID in the URL. Please check the URL and try again."
+        return False, "Could not find a valid playlist ID in the URL. Please check the URL and try again.", None
     
-    return True, ""
+    return True, "", match.group(1)
 
 def validate_youtube_music_url(url):
     """
@@ -101,22 +141,35 @@ def validate_youtube_music_url(url):
         url (str): The playlist URL to validate
         
     Returns:
-        tuple: (is_valid, message) - A boolean indicating if the URL is valid and an error message if not
+        tuple: (is_valid, message, playlist_id) - A boolean indicating if the URL is valid,
+            an error message if not, and the playlist ID if it is
     """
+    # Fast path for the usual music.youtube.com link
+    match = _YT_LIST_RE.search(url) if url.startswith(_YOUTUBE_MUSIC_PREFIX) else None
+    if match:
+        return True, "", match.group(1)
+    
     # Check if URL is from YouTube Music domain
     if 'music.youtube.com' not in url:
-        return False, "This doesn't appear to be a YouTube Music URL. Please enter a URL from music.youtube.com."
+        return False, "This doesn't appear to be a YouTube Music URL. Please enter a URL from music.youtube.com.", None
     
     # Check if URL contains a list parameter
     if 'list=' not in url:
-        return False, "This doesn't appear to be a playlist URL. Please enter a YouTube Music playlist URL."
+        return False, "This doesn't appear to be a playlist URL. Please enter a YouTube Music playlist URL.", None
     
     # Check for a valid playlist ID format
-    match = re.search(r'list=([a-zA-Z0-9_-]+)', url)
+    match = _YT_LIST_RE.search(url)
     if not match:
-        return False, "Could not find a valid playlist ID in the URL. Please check the URL and try again."
+        return False, "Could not find a valid playlist ID in the URL. Please check the URL and try again.", None
     
-    return True, ""
+    return True, "", match.group(1)
+
+# URL validator for each platform
+_URL_VALIDATORS = {
+    'spotify': validate_spotify_url,
+    'apple_music': validate_apple_music_url,
+    'youtube_music': validate_youtube_music_url
+}
 
 def validate_email(email):
     """
@@ -131,9 +184,15 @@ def validate_email(email):
     if not email:
         return False
         
-    # Simple regex pattern for email validation
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    # local@host.tld, where the TLD is at least two letters
+    local, at, domain = email.partition('@')
+    host, dot, tld = domain.rpartition('.')
+    return bool(
+        local and at and host and dot
+        and len(tld) >= 2 and tld.isascii() and tld.isalpha()
+        and _EMAIL_LOCAL_CHARS.issuperset(local)
+        and _EMAIL_DOMAIN_CHARS.issuperset(host)
+    )
 
 def validate_password(password):
     """
@@ -152,19 +211,19 @@ def validate_password(password):
         return False, "Password must be at least 8 characters long."
         
     # Check for at least one uppercase letter
-    if not re.search(r'[A-Z]', password):
+    if not _PW_UPPER_RE.search(password):
         return False, "Password must contain at least one uppercase letter."
         
     # Check for at least one lowercase letter
-    if not re.search(r'[a-z]', password):
+    if not _PW_LOWER_RE.search(password):
         return False, "Password must contain at least one lowercase letter."
         
     # Check for at least one digit
-    if not re.search(r'\d', password):
+    if not _PW_DIGIT_RE.search(password):
         return False, "Password must contain at least one digit."
         
     # Check for at least one special character
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not _PW_SPECIAL_RE.search(password):
         return False, "Password must contain at least one special character."
         
     return True, ""
\ No newline at end of file